@@ -11,7 +11,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (app/migrations.py passes a connection and configures logging itself)
+if config.config_file_name is not None and "connection" not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -25,6 +26,13 @@ from app.models import SQLModel
 
 target_metadata = SQLModel.metadata
 
+# The app's DATABASE_URL (e.g. exported by startup.sh) wins over alembic.ini
+database_url = os.getenv("DATABASE_URL")
+if database_url:
+    config.set_main_option(
+        "sqlalchemy.url", database_url.replace("sqlite+aiosqlite://", "sqlite://")
+    )
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -62,6 +70,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Connection passed in by app/migrations.py
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -0,0 +1,31 @@
+"""Add covering indexes for visitor and analytics queries
+
+Revision ID: 003_add_hot_path_indexes
+Revises: 002_add_exhibit_order_json
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_hot_path_indexes'
+down_revision: Union[str, None] = '002_add_exhibit_order_json'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # "Has this session answered exhibit X?" check in exhibit_detail/save_answer
+    op.create_index('ix_answers_session_question', 'answers', ['session_id', 'question_id'], unique=False)
+    # Analytics: questions -> answers joins counting distinct sessions
+    op.create_index('ix_answers_question_session', 'answers', ['question_id', 'session_id'], unique=False)
+    # Exhibit -> questions lookups (covers the join back to answers)
+    op.create_index('ix_questions_exhibit_id', 'questions', ['exhibit_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_exhibit_id', table_name='questions')
+    op.drop_index('ix_answers_question_session', table_name='answers')
+    op.drop_index('ix_answers_session_question', table_name='answers')
@@ -0,0 +1,61 @@
+"""Add progress bitmap to sessions
+
+Revision ID: 004_add_session_progress
+Revises: 003_add_hot_path_indexes
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_session_progress'
+down_revision: Union[str, None] = '003_add_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.services.exhibit_order.MAX_PROGRESS_BITS
+MAX_PROGRESS_BITS = 63
+
+
+def upgrade() -> None:
+    # progress_mask: bit i set = exhibit_order_json["order"][i] answered
+    op.add_column('sessions', sa.Column('progress_mask', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('sessions', sa.Column('progress_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing answers
+    conn = op.get_bind()
+    answered = {}
+    for session_id, slug in conn.execute(sa.text(
+        "SELECT DISTINCT answers.session_id, exhibits.slug FROM answers "
+        "JOIN questions ON questions.id = answers.question_id "
+        "JOIN exhibits ON exhibits.id = questions.exhibit_id"
+    )):
+        answered.setdefault(session_id, set()).add(slug)
+
+    orders = conn.execute(sa.text(
+        "SELECT id, exhibit_order_json FROM sessions WHERE exhibit_order_json IS NOT NULL"
+    ))
+    for session_id, order_json in orders.fetchall():
+        slugs = answered.get(session_id)
+        if not slugs:
+            continue
+        if isinstance(order_json, str):
+            order_json = json.loads(order_json)
+        order = (order_json or {}).get('order', [])
+        mask = 0
+        for index, slug in enumerate(order[:MAX_PROGRESS_BITS]):
+            if slug in slugs:
+                mask |= 1 << index
+        conn.execute(
+            sa.text("UPDATE sessions SET progress_mask = :mask, progress_count = :count WHERE id = :id"),
+            {"mask": mask, "count": bin(mask).count("1"), "id": session_id},
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('sessions', 'progress_count')
+    op.drop_column('sessions', 'progress_mask')
@@ -0,0 +1,32 @@
+"""Make answers unique per session and question
+
+Revision ID: 005_unique_answers_per_question
+Revises: 004_add_session_progress
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '005_unique_answers_per_question'
+down_revision: Union[str, None] = '004_add_session_progress'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicates left by double submissions, keeping the first answer
+    op.execute(
+        "DELETE FROM answers WHERE id NOT IN "
+        "(SELECT MIN(id) FROM answers GROUP BY session_id, question_id)"
+    )
+    # The unique index replaces the plain lookup index on the same columns
+    op.drop_index('ix_answers_session_question', table_name='answers')
+    op.create_index('uq_answers_session_question', 'answers', ['session_id', 'question_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_answers_session_question', table_name='answers')
+    op.create_index('ix_answers_session_question', 'answers', ['session_id', 'question_id'], unique=False)
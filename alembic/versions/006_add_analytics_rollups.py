@@ -0,0 +1,65 @@
+"""Add analytics rollup tables
+
+Revision ID: 006_add_analytics_rollups
+Revises: 005_unique_answers_per_question
+Create Date: 2026-10-16 16:00:00.000000
+
+The tables are filled from existing data on the next app start
+(app/services/rollups.py backfill_rollups, from run_startup_tasks); they can be
+rebuilt any time with scripts/rebuild_rollups.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_analytics_rollups'
+down_revision: Union[str, None] = '005_unique_answers_per_question'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rollup_daily',
+    sa.Column('day', sa.String(), nullable=False),
+    sa.Column('visitors', sa.Integer(), nullable=False),
+    sa.Column('feedback', sa.Integer(), nullable=False),
+    sa.Column('exhibit_answers', sa.Integer(), nullable=False),
+    sa.Column('exhibits_answered', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('rollup_selfeval',
+    sa.Column('field', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('field', 'value')
+    )
+    op.create_table('rollup_feedback',
+    sa.Column('question_id', sa.String(), nullable=False),
+    sa.Column('rating', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('question_id', 'rating')
+    )
+    op.create_table('rollup_exhibits',
+    sa.Column('exhibit_id', sa.Integer(), nullable=False),
+    sa.Column('sessions_answered', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('exhibit_id')
+    )
+    op.create_table('rollup_answer_options',
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('exhibit_id', sa.Integer(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('question_id', 'value')
+    )
+    op.create_index(op.f('ix_rollup_answer_options_exhibit_id'), 'rollup_answer_options', ['exhibit_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rollup_answer_options_exhibit_id'), table_name='rollup_answer_options')
+    op.drop_table('rollup_answer_options')
+    op.drop_table('rollup_exhibits')
+    op.drop_table('rollup_feedback')
+    op.drop_table('rollup_selfeval')
+    op.drop_table('rollup_daily')
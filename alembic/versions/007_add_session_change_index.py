@@ -0,0 +1,25 @@
+"""Add keyset index for session changes
+
+Revision ID: 007_add_session_change_index
+Revises: 006_add_analytics_rollups
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_session_change_index'
+down_revision: Union[str, None] = '006_add_analytics_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CDC feed: sessions changed after a (last_activity, id) cursor
+    op.create_index('ix_sessions_last_activity_id', 'sessions', ['last_activity', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_last_activity_id', table_name='sessions')
@@ -0,0 +1,35 @@
+"""Add content manifest for incremental content sync
+
+Revision ID: 008_add_content_manifest
+Revises: 007_add_session_change_index
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_content_manifest'
+down_revision: Union[str, None] = '007_add_session_change_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('content_manifest',
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('slug', sa.String(), nullable=True),
+    sa.Column('exhibit_id', sa.Integer(), nullable=True),
+    sa.Column('mtime_ns', sa.Integer(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(), nullable=False),
+    sa.Column('parser_version', sa.Integer(), nullable=False),
+    sa.Column('synced_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('path')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('content_manifest')
@@ -2,16 +2,19 @@
 Database connection and session management for Gallery Twin.
 """
 
+import asyncio
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel, select
 
+from app.logging_config import db_logger
 from app.models import Session
 
 
@@ -25,12 +28,83 @@ if DATABASE_URL.startswith("sqlite:///"):
 else:
     ASYNC_DATABASE_URL = DATABASE_URL
 
+# SQLite performance profiles, applied to every pooled connection.
+# Select with SQLITE_PROFILE (default: balanced).
+# - durable:  fsync on every commit, no mmap
+# - balanced: WAL + synchronous=NORMAL (durable across app crashes; a power
+#             loss may drop the last transactions but never corrupts the DB)
+# - fast:     no fsync at all; for demos/load tests only
+SQLITE_PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,  # KiB (negative = size, not pages)
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,  # ms
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "balanced").lower()
+
+
+def apply_sqlite_pragmas(async_engine: AsyncEngine, profile: str) -> Dict[str, Any]:
+    """
+    Register a connect hook that applies the named pragma profile to every
+    new DBAPI connection of the engine. Unknown profiles fall back to balanced.
+    Returns the pragmas that will be applied.
+    """
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        db_logger.warning(f"Unknown SQLITE_PROFILE '{profile}', using 'balanced'")
+        profile = "balanced"
+    pragmas = SQLITE_PRAGMA_PROFILES[profile]
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return pragmas
+
+
+async def get_sqlite_settings(async_engine: AsyncEngine) -> Dict[str, Any]:
+    """Read back the effective pragma values from a pooled connection."""
+    settings = {}
+    async with async_engine.connect() as conn:
+        for name in SQLITE_PRAGMA_PROFILES["balanced"]:
+            result = await conn.exec_driver_sql(f"PRAGMA {name}")
+            settings[name] = result.scalar()
+    return settings
+
+
 # Create async engine
 engine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=os.getenv("DEBUG", "false").lower() == "true",
     connect_args={"check_same_thread": False} if "sqlite" in ASYNC_DATABASE_URL else {},
 )
+if "sqlite" in ASYNC_DATABASE_URL:
+    apply_sqlite_pragmas(engine, SQLITE_PROFILE)
 
 # Create async session factory
 async_session_factory = sessionmaker(
@@ -38,10 +112,19 @@ async_session_factory = sessionmaker(
 )
 
 
+def _create_unmanaged_schema(sync_conn) -> None:
+    # Databases under Alembic (alembic_version table, see app/migrations.py) are only
+    # changed by migrations; create_all would add new tables and indexes ahead
+    # of the migrations that create them, and those would then fail
+    if inspect(sync_conn).has_table("alembic_version"):
+        return
+    SQLModel.metadata.create_all(sync_conn)
+
+
 async def create_db_and_tables():
-    """Create database tables on startup."""
+    """Create database tables on startup unless Alembic manages the schema."""
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_create_unmanaged_schema)
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -68,10 +151,254 @@ async def get_session() -> AsyncSession:
     return async_session_factory()
 
 
+# A write unit stages changes on the session it is given (add/execute) and must
+# not commit; its return value is handed back to the submitter. Units may be
+# run more than once (see WriteQueue), so they should build their ORM objects
+# inside the unit rather than capture them.
+WriteUnit = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """
+    Single writer for the SQLite database with group commit.
+
+    SQLite allows one writer at a time, so concurrent request handlers
+    committing on their own sessions just queue up on the write lock. Instead,
+    handlers submit write units here; one background task drains the queue and
+    runs up to max_batch units in a single transaction, resolving every
+    submitter's future once the batch has committed.
+
+    If a batch fails, it is rolled back and its units are retried one per
+    transaction so a single bad unit only fails its own submitter.
+
+    Args:
+        session_factory: Factory for the writer's own sessions.
+        max_batch: Maximum number of units committed together.
+        linger: Seconds to wait for more units after the first one arrives
+            (0 = commit whatever is already queued).
+    """
+
+    def __init__(self, session_factory, max_batch: int = 64, linger: float = 0.002):
+        self.session_factory = session_factory
+        self.max_batch = max(1, max_batch)
+        self.linger = linger
+        self.batches = 0
+        self.units = 0
+        self.failed_batches = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        """Units waiting to be committed."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "depth": self.depth,
+            "batches": self.batches,
+            "units": self.units,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": round(self.units / self.batches, 2) if self.batches else 0.0,
+            "max_batch": self.max_batch,
+            "linger_ms": self.linger * 1000,
+        }
+
+    async def submit(self, unit: WriteUnit, db_session: AsyncSession) -> Any:
+        """
+        Run a write unit and return its result once it is committed.
+
+        When the writer task is not running (tests, scripts), the unit runs
+        directly on db_session and is committed there.
+        """
+        if self._task is None:
+            result = await unit(db_session)
+            await db_session.commit()
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((unit, future))
+        return await future
+
+    async def _collect(self, first) -> List[Tuple[WriteUnit, asyncio.Future]]:
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.linger
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                # Stop sentinel: commit what we have, then exit
+                self._queue.put_nowait(None)
+                break
+            batch.append(item)
+        return batch
+
+    async def _commit_batch(self, batch: List[Tuple[WriteUnit, asyncio.Future]]) -> None:
+        results = []
+        try:
+            async with self.session_factory() as session:
+                for unit, _ in batch:
+                    results.append(await unit(session))
+                await session.commit()
+        except Exception as exc:
+            self.failed_batches += 1
+            if len(batch) == 1:
+                unit, future = batch[0]
+                if not future.done():
+                    future.set_exception(exc)
+                return
+            db_logger.warning(
+                f"Group commit of {len(batch)} writes failed ({exc}); retrying individually"
+            )
+            for item in batch:
+                await self._commit_batch([item])
+            return
+
+        self.batches += 1
+        self.units += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = await self._collect(first)
+            try:
+                await self._commit_batch(batch)
+            except Exception as exc:
+                # Never let the writer die; fail the waiting submitters
+                db_logger.error(f"Write queue batch failed: {exc}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def start(self) -> None:
+        """Start the writer task (call from app lifespan)."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Commit everything already queued, then stop the writer task."""
+        if self._task is not None:
+            # New submissions run inline from here on
+            task, self._task = self._task, None
+            self._queue.put_nowait(None)
+            await task
+            self._queue = None
+
+
+write_queue = WriteQueue(
+    async_session_factory,
+    max_batch=int(os.getenv("WRITE_QUEUE_MAX_BATCH", "64")),
+    linger=float(os.getenv("WRITE_QUEUE_LINGER_MS", "2")) / 1000,
+)
+
+
+# A read query runs one or more SELECTs on the session it is given and returns
+# the result; it must not write.
+ReadQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class ParallelReader:
+    """
+    Runs independent read queries concurrently, each on its own connection.
+
+    One AsyncSession cannot run statements concurrently, so gathering several
+    queries on it serializes them at best. Here every query gets a fresh
+    session on the same engine, i.e. its own pooled connection. With WAL, the
+    readers see a consistent snapshot per statement, do not block each other
+    and do not block the writer; SQLite runs them in parallel on aiosqlite's
+    worker threads, so the wall time is that of the slowest query.
+
+    Uncommitted changes of the caller's session are not visible to the
+    queries. Databases that cannot be shared between connections (in-memory
+    SQLite) run the queries one after another on the caller's session.
+
+    Args:
+        max_concurrency: Queries running at the same time (process-wide), so
+            concurrent dashboards cannot exhaust the connection pool.
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max(1, max_concurrency)
+        self.batches = 0
+        self.queries = 0
+        self.sequential_batches = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _shareable(bind) -> bool:
+        database = bind.url.database if bind is not None else None
+        return bool(database) and database != ":memory:" and "mode=memory" not in database
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "batches": self.batches,
+            "queries": self.queries,
+            "sequential_batches": self.sequential_batches,
+        }
+
+    async def gather(self, db_session: AsyncSession, *queries: ReadQuery) -> List[Any]:
+        """Run the queries and return their results in order."""
+        self.batches += 1
+        self.queries += len(queries)
+        bind = db_session.bind
+        if not self._shareable(bind):
+            self.sequential_batches += 1
+            return [await query(db_session) for query in queries]
+
+        semaphore = self._get_semaphore()
+
+        async def run(query: ReadQuery) -> Any:
+            async with semaphore:
+                async with AsyncSession(bind, expire_on_commit=False) as session:
+                    return await query(session)
+
+        return list(await asyncio.gather(*(run(query) for query in queries)))
+
+
+parallel_reader = ParallelReader(
+    max_concurrency=int(os.getenv("ANALYTICS_READ_CONCURRENCY", "4")),
+)
+
+
 # Utility functions for database operations
 async def init_database():
     """Initialize database - create tables if they don't exist."""
     await create_db_and_tables()
+    if "sqlite" in ASYNC_DATABASE_URL:
+        settings = await get_sqlite_settings(engine)
+        db_logger.info(
+            f"SQLite profile '{SQLITE_PROFILE}' effective settings: "
+            + ", ".join(f"{k}={v}" for k, v in settings.items())
+        )
 
 
 async def close_database():
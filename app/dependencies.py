@@ -5,17 +5,59 @@ from typing import Annotated, Tuple
 
 from fastapi import Depends, Form, Header, HTTPException, Request
 from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 from starlette.status import HTTP_403_FORBIDDEN
 
-from app.db import get_async_session
+from app.db import WriteUnit, get_async_session, write_queue
 from app.models import Session
 from app.services.exhibit_order import generate_random_exhibit_order
+from app.services.session_activity import activity_buffer
+from app.session_cookie import SessionCookie, signed_sessions_enabled
 
 SECRET_KEY = os.getenv("SECRET_KEY", "a-very-secret-key")
 
 
+def _new_session_unit(
+    session_uuid: uuid.UUID,
+    user_agent: str | None,
+    accept_language: str | None,
+    exhibit_order_json: dict,
+) -> WriteUnit:
+    """
+    Write unit inserting a Session row unless one with the UUID exists;
+    returns the row.
+
+    In signed mode the UUID comes from the cookie, so concurrent first writes
+    of one visitor insert the same UUID: the loser keeps the winner's row
+    (INSERT ... ON CONFLICT DO NOTHING) instead of failing.
+    """
+
+    async def unit(db_session: AsyncSession) -> Session:
+        now = datetime.now(timezone.utc)
+        await db_session.execute(
+            sqlite_insert(Session.__table__)
+            .values(
+                uuid=session_uuid,
+                user_agent=user_agent,
+                accept_lang=accept_language,
+                exhibit_order_json=exhibit_order_json,
+                completed=False,
+                created_at=now,
+                last_activity=now,
+            )
+            .on_conflict_do_nothing(index_elements=["uuid"])
+        )
+        result = await db_session.execute(
+            select(Session).where(Session.uuid == session_uuid)
+        )
+        return result.scalar_one()
+
+    return unit
+
+
 async def track_session(
     request: Request,
     db_session: Annotated[AsyncSession, Depends(get_async_session)],
@@ -31,6 +73,11 @@ async def track_session(
       for the middleware to set the cookie.
     """
     session_uuid_str = getattr(request.state, "session_id", None)
+    # Verified signed cookie (SESSION_MODE=signed only); its own max_age
+    # already enforces the TTL and it may precede the DB row.
+    session_cookie = (
+        request.state.session_cookie if signed_sessions_enabled() else None
+    )
     db_session_obj = None
 
     if session_uuid_str:
@@ -41,25 +88,52 @@ async def track_session(
             )
             found_session = result.scalar_one_or_none()
 
-            if found_session:
+            if found_session and session_cookie is not None:
+                # The signed cookie's max_age has already enforced the TTL
+                db_session_obj = found_session
+            elif found_session:
                 # Use SESSION_TTL (seconds) to control session expiry (default 30 days)
                 session_ttl = int(
                     os.getenv("SESSION_TTL", "2592000")
                 )  # 30 * 24 * 60 * 60
-                session_age = datetime.now(
-                    timezone.utc
-                ) - found_session.last_activity.replace(tzinfo=timezone.utc)
-
-                if session_age.total_seconds() <= session_ttl:
-                    # Session is valid and not expired; refresh last_activity
+                last_activity = activity_buffer.last_activity(
+                    found_session.uuid, found_session.last_activity
+                )
+                session_age = datetime.now(timezone.utc) - last_activity
+
+                if session_age.total_seconds() <= activity_buffer.ttl_with_staleness(
+                    session_ttl
+                ):
+                    # Session is valid and not expired
                     db_session_obj = found_session
-                    db_session_obj.last_activity = datetime.now(timezone.utc)
-                    await db_session.commit()
+
+            if db_session_obj is not None:
+                # Refresh last_activity in the write-behind buffer
+                # (no per-request commit)
+                set_committed_value(
+                    db_session_obj,
+                    "last_activity",
+                    activity_buffer.touch(
+                        db_session_obj.uuid, db_session_obj.last_activity
+                    ),
+                )
 
         except (ValueError, TypeError):
             # Invalid UUID in cookie, treat as no session
             pass
 
+    if db_session_obj is None and session_cookie is not None:
+        # Signed cookie issued by a read-only page: persist it on first write
+        db_session_obj = await write_queue.submit(
+            _new_session_unit(
+                session_cookie.uuid,
+                user_agent,
+                accept_language,
+                session_cookie.exhibit_order_json,
+            ),
+            db_session,
+        )
+
     if db_session_obj is None:
         # Create a new session if:
         # - No cookie was provided
@@ -70,21 +144,73 @@ async def track_session(
         # Generate random exhibit order for new session
         exhibit_order = generate_random_exhibit_order()
 
-        db_session_obj = Session(
-            uuid=uuid.uuid4(),
-            user_agent=user_agent,
-            accept_lang=accept_language,
-            exhibit_order_json={"order": exhibit_order},
+        db_session_obj = await write_queue.submit(
+            _new_session_unit(
+                uuid.uuid4(), user_agent, accept_language, {"order": exhibit_order}
+            ),
+            db_session,
+        )
+
+    if signed_sessions_enabled():
+        # Keep the cookie in sync with the DB row (answered set carries over)
+        answered = (
+            session_cookie.answered
+            if session_cookie is not None and session_cookie.uuid == db_session_obj.uuid
+            else frozenset()
+        )
+        order = (db_session_obj.exhibit_order_json or {}).get("order", [])
+        request.state.session_cookie = SessionCookie(
+            uuid=db_session_obj.uuid, exhibit_order=tuple(order), answered=answered
         )
-        db_session.add(db_session_obj)
-        await db_session.commit()
-        await db_session.refresh(db_session_obj)
 
     # Set the definitive session ID for the middleware to use
     request.state.session_id = str(db_session_obj.uuid)
     return db_session_obj, db_session
 
 
+async def track_session_view(
+    request: Request,
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    user_agent: Annotated[str | None, Header()] = None,
+    accept_language: Annotated[str | None, Header()] = None,
+) -> Tuple[Session | SessionCookie, AsyncSession]:
+    """
+    FastAPI dependency for read-only pages.
+
+    - In the default DB mode this is the same as track_session.
+    - With SESSION_MODE=signed the session comes from the signed cookie and no
+      DB query is made; visitors without a cookie get a fresh SessionCookie
+      that is persisted by track_session on their first POST.
+    """
+    if not signed_sessions_enabled():
+        return await track_session(request, db_session, user_agent, accept_language)
+
+    session_cookie = request.state.session_cookie
+    if session_cookie is None:
+        if request.state.session_id:
+            # Legacy plain-UUID cookie: resolve once through the DB
+            return await track_session(
+                request, db_session, user_agent, accept_language
+            )
+        session_cookie = SessionCookie(
+            uuid=uuid.uuid4(),
+            exhibit_order=tuple(generate_random_exhibit_order()),
+        )
+        request.state.session_cookie = session_cookie
+
+    request.state.session_id = str(session_cookie.uuid)
+    return session_cookie, db_session
+
+
+def mark_exhibit_answered(request: Request, slug: str) -> None:
+    """Record an answered exhibit in the signed session cookie (signed mode only)."""
+    if not signed_sessions_enabled():
+        return
+    session_cookie = request.state.session_cookie
+    if session_cookie is not None:
+        request.state.session_cookie = session_cookie.with_answered(slug)
+
+
 def get_csrf_token(session_id: str) -> str:
     """Generate a CSRF token for the given session ID.""" ""
     serializer = URLSafeTimedSerializer(SECRET_KEY)
@@ -68,10 +68,18 @@ content_logger = logging.getLogger("gallery_twin.content")
 request_logger = logging.getLogger("gallery_twin.request")
 
 
-def log_request(request, status_code: int):
+def log_request(
+    method: str,
+    path: str,
+    status_code: int,
+    client_host: str | None,
+    duration_ms: float,
+) -> None:
     """Log incoming HTTP requests."""
+    if not request_logger.isEnabledFor(logging.DEBUG):
+        return
     request_logger.debug(
-        f"{request.method} {request.url.path} | STATUS={status_code} | IP={request.client.host}"
+        f"{method} {path} | STATUS={status_code} | IP={client_host} | TIME={duration_ms:.1f}ms"
     )
 
 
@@ -1,3 +1,5 @@
+import time
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -11,46 +13,67 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 from sqlalchemy import text
 
-from app.middleware import SessionMiddleware, RequestLoggingMiddleware, ProxyHeadersMiddleware
+from app.middleware import GalleryMiddleware
 from app.services.startup_tasks import run_startup_tasks
-from app.services.site_copy import load_site_copy
-from app.db import get_async_session
+from app.services.config_registry import config_registry
+from app.services.content_reload import content_reloader
+from app.services.site_copy import bind_site_copy_global
+from app.services.session_activity import activity_buffer
+from app.services.analytics_snapshot import analytics_snapshot
+from app.services.event_buffer import event_buffer
+from app.db import get_async_session, write_queue
 from app.logging_config import logger
 from fastapi.templating import Jinja2Templates
-from fastapi import Request
 from typing import Optional
 from jinja2 import pass_context
 
 from contextlib import asynccontextmanager
-from app.services.content_loader import get_yaml_slugs
-from markdown_it import MarkdownIt
+from app.services.content_loader import get_cached_yaml_slugs
+from app.services.markdown_cache import markdown_renderer
 
 
-@asynccontextmanager
-async def lifespan(app):
-    # Startup
-    logger.info("Starting Gallery Twin application")
-    await run_startup_tasks()
-    # Load current YAML-defined slugs into application state
+def _set_yaml_slugs(app) -> None:
     try:
-        slugs = get_yaml_slugs("content/exhibits")
+        slugs = get_cached_yaml_slugs("content/exhibits")
     except Exception as exc:
         logger.error(f"Failed to load YAML slugs: {exc}")
         slugs = []
     app.state.yaml_slugs = slugs
-    logger.info("Application startup completed")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Startup
+    logger.info("Starting Gallery Twin application")
+    started = time.perf_counter()
+    await run_startup_tasks()
+    # Keep YAML-defined slugs in application state, refreshed on content reload
+    content_reloader.add_listener(lambda _registry: _set_yaml_slugs(app))
+    content_reloader.start()
+    config_registry.start()
+    activity_buffer.start()
+    event_buffer.start()
+    write_queue.start()
+    analytics_snapshot.start()
+    logger.info(
+        f"Application startup completed in {(time.perf_counter() - started) * 1000:.1f} ms"
+    )
     yield
     # Shutdown
     logger.info("Shutting down Gallery Twin application")
+    await analytics_snapshot.stop()
+    await write_queue.stop()
+    await event_buffer.stop()
+    await activity_buffer.stop()
+    await config_registry.stop()
+    await content_reloader.stop()
 
 
 app = FastAPI(title="Gallery Twin", lifespan=lifespan)
 
-# Middleware is added before routers (order matters: last added = first executed)
-# ProxyHeadersMiddleware must be first to properly detect HTTPS from Azure
-app.add_middleware(ProxyHeadersMiddleware)
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(SessionMiddleware)
+# Single pure-ASGI middleware: proxy headers, request state, session cookie
+# and request logging in one pass (see app/middleware.py)
+app.add_middleware(GalleryMiddleware)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -58,32 +81,12 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Centralized templates instance so we can register globals in one place
 templates = Jinja2Templates(directory="app/templates")
 
-# Initialize markdown parser
-md = MarkdownIt()
-
-# Register markdown filter
-def markdown_filter(text):
-    """Convert markdown to HTML."""
-    if not text:
-        return ""
-    return md.render(text)
-
-templates.env.filters["markdown"] = markdown_filter
-
-# Load site copy (texts for header/footer/index/thanks) and register as template global
-site_copy = load_site_copy(content_dir="content") or {}
-templates.env.globals["site_copy"] = site_copy
-
-
-@app.middleware("http")
-async def inject_template_globals(request: Request, call_next):
-    """Middleware for session handling only."""
-    # App is English-only: no translation setup needed
-    request.state.lang = "en"
+# Markdown filter for ad-hoc strings (LRU-cached); exhibit text is rendered
+# once into ExhibitRecord.text_html when the content registry is built
+templates.env.filters["markdown"] = markdown_renderer.render
 
-    # Proceed with the request
-    response = await call_next(request)
-    return response
+# Site copy (texts for header/footer/index/thanks) as template global
+bind_site_copy_global(templates.env)
 
 
 @app.get("/health")
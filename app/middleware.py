@@ -1,93 +1,181 @@
+import http.cookies
 import os
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable, Awaitable
-from starlette.requests import Request
-from starlette.responses import Response
+import time
 
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.dependencies import SECRET_KEY
 from app.logging_config import log_request
+from app.session_cookie import (
+    decode_session_cookie,
+    encode_session_cookie,
+    signed_sessions_enabled,
+)
 
 SESSION_COOKIE_NAME = "gallery_session_id"
 
+# Path prefixes served without session/cookie/logging work (static files,
+# health probes). Comma-separated, e.g. "/static,/health,/favicon.ico".
+BYPASS_PATHS = tuple(
+    p.strip().rstrip("/")
+    for p in os.getenv("MIDDLEWARE_BYPASS_PATHS", "/static,/health").split(",")
+    if p.strip()
+)
 
-class ProxyHeadersMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to handle X-Forwarded-* headers from reverse proxies like Azure App Service.
 
-    Azure terminates SSL and forwards HTTP to the container, but sets X-Forwarded-Proto: https.
-    This middleware updates the request scope so FastAPI/Starlette correctly recognizes HTTPS.
-    """
+class MiddlewareMetrics:
+    """Counters showing how many requests took the fast path."""
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        # Check if the request came through a proxy with X-Forwarded-Proto header
-        forwarded_proto = request.headers.get("X-Forwarded-Proto")
-        if forwarded_proto:
-            # Update the request scope to reflect the original protocol
-            request.scope["scheme"] = forwarded_proto
+    def __init__(self):
+        self.handled = 0
+        self.bypassed = 0
 
-        # Also handle X-Forwarded-Host if present (for correct URL generation)
-        forwarded_host = request.headers.get("X-Forwarded-Host")
-        if forwarded_host:
-            request.scope["server"] = (forwarded_host, None)
+    def snapshot(self) -> dict:
+        total = self.handled + self.bypassed
+        return {
+            "handled": self.handled,
+            "bypassed": self.bypassed,
+            "bypass_ratio": round(self.bypassed / total, 3) if total else 0.0,
+            "bypass_paths": list(BYPASS_PATHS),
+        }
 
-        response = await call_next(request)
-        return response
 
+middleware_metrics = MiddlewareMetrics()
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log incoming HTTP requests."""
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        response = await call_next(request)
-        log_request(request, response.status_code)
-        return response
+def is_bypass_path(path: str, prefixes: tuple = BYPASS_PATHS) -> bool:
+    """Return True if path equals or is below one of the bypass prefixes."""
+    for prefix in prefixes:
+        if path == prefix or path.startswith(prefix + "/"):
+            return True
+    return False
 
 
-class SessionMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to manage the session cookie lifecycle.
+def _session_cookie_header(value: str | None, max_age: int, secure: bool) -> str:
+    """Build a Set-Cookie header value (same format as Response.set_cookie)."""
+    cookie: http.cookies.BaseCookie[str] = http.cookies.SimpleCookie()
+    cookie[SESSION_COOKIE_NAME] = "" if value is None else value
+    morsel = cookie[SESSION_COOKIE_NAME]
+    morsel["max-age"] = max_age
+    morsel["expires"] = max_age
+    morsel["path"] = "/"
+    if secure:
+        morsel["secure"] = True
+    morsel["httponly"] = True
+    morsel["samesite"] = "lax"
+    return cookie.output(header="").strip()
+
 
-    It reads the session ID from the cookie and makes it available in request.state.
-    After the request is handled, it checks if the session ID has changed (e.g.,
-    due to expiration or invalidity). If so, it sets the new cookie on the response.
-    All session logic (validation, creation) is handled in the track_session dependency.
+class GalleryMiddleware:
     """
+    Single pure-ASGI middleware handling everything around a request.
+
+    Replaces the former ProxyHeadersMiddleware, RequestLoggingMiddleware and
+    SessionMiddleware (BaseHTTPMiddleware subclasses) plus the
+    inject_template_globals HTTP middleware. Work happens in one pass over the
+    scope and the http.response.start message; the response body is passed
+    through untouched.
+
+    1. Proxy headers: Azure terminates SSL and forwards HTTP to the container,
+       but sets X-Forwarded-Proto/X-Forwarded-Host. The scope is updated so
+       Starlette correctly recognizes HTTPS and the original host.
+    2. Request state: request.state.lang (app is English-only).
+    3. Session cookie: the session ID from the cookie is exposed as
+       request.state.session_id for the track_session dependency. With
+       SESSION_MODE=signed the cookie is a signed SessionCookie instead, exposed
+       as request.state.session_cookie. When the response starts, the cookie is
+       (re)set with the definitive session state (sliding expiration).
+    4. Logging: method, path, status and duration of every request.
+
+    Requests under bypass_paths (default BYPASS_PATHS: /static and /health)
+    get the proxy headers applied but skip steps 2-4, so static files carry no
+    Set-Cookie header and stay cacheable by shared HTTP caches.
+    """
+
+    def __init__(self, app: ASGIApp, bypass_paths: tuple = BYPASS_PATHS):
+        self.app = app
+        self.bypass_paths = bypass_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        # 1. Get session ID from cookie, if it exists.
-        original_session_id = request.cookies.get(SESSION_COOKIE_NAME)
-        # 2. Make it available for the track_session dependency.
-        request.state.session_id = original_session_id
-
-        # 3. Let the app and dependencies handle the request.
-        # The track_session dependency will validate the session and may create
-        # a new one, updating request.state.session_id to the new ID.
-        response = await call_next(request)
-
-        # 4. Get the final session ID after the dependency has run.
-        final_session_id = getattr(request.state, "session_id", original_session_id)
-
-        # 5. Set (or refresh) the cookie on the response so the browser-side
-        # expiration mirrors the server-side TTL. Use SESSION_TTL env var
-        # (seconds) and default to 60s for short sessions in dev/test.
-        max_age = int(os.getenv("SESSION_TTL", "60"))
-        # Always set the cookie with the definitive session id so the
-        # browser receives a refreshed expiry (sliding expiration behavior).
-        # Use secure flag when request is over HTTPS (detected via X-Forwarded-Proto)
-        is_secure = request.url.scheme == "https"
-        response.set_cookie(
-            key=SESSION_COOKIE_NAME,
-            value=final_session_id,
-            httponly=True,
-            secure=is_secure,
-            samesite="lax",
-            max_age=max_age,
-            expires=max_age,
-        )
-
-        return response
+        headers = Headers(scope=scope)
+
+        # 1. Proxy headers (bypassed paths too: redirects and URLs use them)
+        forwarded_proto = headers.get("x-forwarded-proto")
+        if forwarded_proto:
+            scope["scheme"] = forwarded_proto
+        forwarded_host = headers.get("x-forwarded-host")
+        if forwarded_host:
+            scope["server"] = (forwarded_host, None)
+
+        if is_bypass_path(scope["path"], self.bypass_paths):
+            middleware_metrics.bypassed += 1
+            await self.app(scope, receive, send)
+            return
+
+        middleware_metrics.handled += 1
+        started = time.perf_counter()
+
+        # 2. Request state (shared with Request.state via scope["state"])
+        state = scope.setdefault("state", {})
+        state["lang"] = "en"
+
+        # 3. Session cookie in
+        session_id = cookie_parser(headers.get("cookie", "")).get(SESSION_COOKIE_NAME)
+        # In signed mode the cookie carries the whole session state; a cookie
+        # that fails verification is passed through as a plain (legacy) id.
+        state["session_cookie"] = None
+        if signed_sessions_enabled() and session_id:
+            session_cookie = decode_session_cookie(
+                session_id,
+                SECRET_KEY,
+                max_age=int(os.getenv("SESSION_TTL", "2592000")),
+            )
+            if session_cookie is not None:
+                state["session_cookie"] = session_cookie
+                session_id = str(session_cookie.uuid)
+        state["session_id"] = session_id
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Session cookie out: the track_session dependency may have
+                # replaced the session (expired/invalid) in request.state.
+                session_cookie = state.get("session_cookie")
+                cookie_value = (
+                    encode_session_cookie(session_cookie, SECRET_KEY)
+                    if session_cookie is not None
+                    else state.get("session_id", session_id)
+                )
+                # Browser-side expiration mirrors the server-side TTL. Use
+                # SESSION_TTL env var (seconds), default 60s for dev/test.
+                # Secure flag when served over HTTPS (see proxy headers above).
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    _session_cookie_header(
+                        cookie_value,
+                        max_age=int(os.getenv("SESSION_TTL", "60")),
+                        secure=scope["scheme"] == "https",
+                    ),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 4. Logging
+            log_request(
+                scope["method"],
+                scope["path"],
+                status_code,
+                scope["client"][0] if scope.get("client") else None,
+                duration_ms=(time.perf_counter() - started) * 1000,
+            )
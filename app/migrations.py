@@ -0,0 +1,71 @@
+"""
+Database migrations at startup (run by startup.sh before the app starts).
+
+Databases created by create_all have no alembic_version table, so a plain
+"alembic upgrade head" would replay 001 on top of the existing tables. They
+are stamped first:
+
+- The schema of the releases before Alembic took over (exhibits, sessions,
+  ... without the progress columns) is revision 002_add_exhibit_order_json
+- A complete current schema (created by the app on an empty database) is
+  stamped head
+
+Usage:
+    python -m app.migrations
+"""
+
+import os
+from logging.config import fileConfig
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (registers the tables in SQLModel.metadata)
+from app.logging_config import db_logger
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+PRE_ALEMBIC_REVISION = "002_add_exhibit_order_json"
+
+
+def _sync_url(database_url: str) -> str:
+    return database_url.replace("sqlite+aiosqlite://", "sqlite://")
+
+
+def unversioned_revision(connection) -> Optional[str]:
+    """
+    Revision to stamp a database with that has tables but no alembic_version
+    table; None when it is versioned or empty.
+    """
+    tables = set(inspect(connection).get_table_names())
+    if "alembic_version" in tables or not tables:
+        return None
+    if set(SQLModel.metadata.tables) <= tables:
+        return "head"
+    return PRE_ALEMBIC_REVISION
+
+
+def upgrade_database(database_url: str) -> None:
+    """Stamp an unversioned database if needed and upgrade it to head."""
+    config = Config(str(ALEMBIC_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    engine = create_engine(_sync_url(database_url))
+    try:
+        with engine.begin() as connection:
+            # alembic/env.py runs on this connection instead of its own URL
+            config.attributes["connection"] = connection
+            revision = unversioned_revision(connection)
+            if revision is not None:
+                db_logger.info(f"Stamping unversioned database as {revision}")
+                command.stamp(config, revision)
+            command.upgrade(config, "head")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    fileConfig(ALEMBIC_DIR / "alembic.ini", disable_existing_loggers=False)
+    upgrade_database(os.getenv("DATABASE_URL", "sqlite:////home/database/gallery.db"))
@@ -9,7 +9,7 @@ from typing import List, Optional
 from uuid import UUID, uuid4
 
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, Index, func
 
 
 class QuestionType(str, Enum):
@@ -77,7 +77,11 @@ class Question(SQLModel, table=True):
     """Question model for surveys."""
 
     __tablename__ = "questions"
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        # Covering index for exhibit -> questions lookups (hot path + analytics)
+        Index("ix_questions_exhibit_id", "exhibit_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     exhibit_id: Optional[int] = Field(
@@ -100,6 +104,10 @@ class Session(TimestampMixin, SQLModel, table=True):
     """Session model for tracking user visits."""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Keyset order of session changes for the CDC feed
+        Index("ix_sessions_last_activity_id", "last_activity", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     uuid: UUID = Field(default_factory=uuid4, unique=True, index=True)
@@ -117,6 +125,18 @@ class Session(TimestampMixin, SQLModel, table=True):
         sa_column=Column(JSON),
         description="Randomizované pořadí exhibit slugs pro tuto session",
     )
+    # Answered exhibits: bit i set = exhibit_order_json["order"][i] answered.
+    # progress_count is the number of set bits; both maintained by save_answer.
+    progress_mask: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": "0"},
+        description="Bitmask zodpovězených exponátů (dle exhibit_order_json)",
+    )
+    progress_count: int = Field(
+        default=0,
+        sa_column_kwargs={"server_default": "0"},
+        description="Počet zodpovězených exponátů",
+    )
     last_activity: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True)),
@@ -132,6 +152,14 @@ class Answer(TimestampMixin, SQLModel, table=True):
     """Answer model for survey responses."""
 
     __tablename__ = "answers"
+    __table_args__ = (
+        # One answer per question and session; save_answer relies on it for
+        # INSERT ... ON CONFLICT DO NOTHING. Also serves "has this session
+        # answered exhibit X?" lookups.
+        Index("uq_answers_session_question", "session_id", "question_id", unique=True),
+        # Analytics joins questions -> answers counting distinct sessions
+        Index("ix_answers_question_session", "question_id", "session_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     session_id: int = Field(foreign_key="sessions.id")
@@ -166,3 +194,79 @@ class Event(TimestampMixin, SQLModel, table=True):
     # Relationships
     session: Session = Relationship(back_populates="events")
     exhibit: Optional[Exhibit] = Relationship(back_populates="events")
+
+
+# Analytics rollups: maintained incrementally by the visitor write units
+# (app/services/rollups.py) and rebuilt from raw tables by
+# scripts/rebuild_rollups.py. The admin dashboard reads only these.
+class DailyRollup(SQLModel, table=True):
+    """Per-day visitor counters, keyed by the session's creation date (UTC)."""
+
+    __tablename__ = "rollup_daily"
+
+    day: str = Field(primary_key=True)  # YYYY-MM-DD
+    visitors: int = Field(default=0)  # sessions with selfeval
+    feedback: int = Field(default=0)  # sessions with exhibition feedback
+    exhibit_answers: int = Field(default=0)  # answers to exhibit questions
+    exhibits_answered: int = Field(default=0)  # sum of visitors' progress_count
+
+
+class SelfevalRollup(SQLModel, table=True):
+    """Visitor count per selfeval field value."""
+
+    __tablename__ = "rollup_selfeval"
+
+    field: str = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class FeedbackRollup(SQLModel, table=True):
+    """Histogram of likert ratings per exhibition feedback question."""
+
+    __tablename__ = "rollup_feedback"
+
+    question_id: str = Field(primary_key=True)
+    rating: int = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class ExhibitRollup(SQLModel, table=True):
+    """Number of sessions that answered at least one question per exhibit."""
+
+    __tablename__ = "rollup_exhibits"
+
+    exhibit_id: int = Field(primary_key=True)
+    sessions_answered: int = Field(default=0)
+
+
+class AnswerOptionRollup(SQLModel, table=True):
+    """Answer counts per option of choice/likert exhibit questions."""
+
+    __tablename__ = "rollup_answer_options"
+
+    question_id: int = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    exhibit_id: Optional[int] = Field(default=None, index=True)
+    count: int = Field(default=0)
+
+
+class ContentManifest(SQLModel, table=True):
+    """
+    Last synced state of each exhibit YAML file (app/services/content_loader.py).
+
+    A file whose mtime/size match is skipped without being read; one whose
+    content hash matches is skipped without being parsed. Bumping
+    parser_version (CONTENT_PARSER_VERSION) forces a full re-sync.
+    """
+
+    __tablename__ = "content_manifest"
+
+    path: str = Field(primary_key=True)
+    slug: Optional[str] = None
+    exhibit_id: Optional[int] = None
+    mtime_ns: int
+    size: int
+    sha256: str
+    parser_version: int
+    synced_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
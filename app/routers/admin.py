@@ -1,12 +1,35 @@
-from typing import Annotated
+import asyncio
+from datetime import datetime
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import get_admin_user
-from app.db import get_async_session
+from app.db import get_async_session, parallel_reader, write_queue
+from app.middleware import middleware_metrics
 from app.services import analytics
+from app.services.analytics_snapshot import analytics_snapshot, get_analytics_session
+from app.services.cdc import (
+    CDC_PAGE_SIZE,
+    CdcCursor,
+    InvalidCursor,
+    iter_changes_ndjson,
+    plan_page,
+)
+from app.services import content_loader
+from app.services.config_registry import config_registry
+from app.services.content_bundle import content_bundle
+from app.services.content_loader import slug_cache
+from app.services.content_registry import get_content_registry
+from app.services.content_reload import content_reloader
+from app.services.dashboard_cache import dashboard_cache
+from app.services.event_buffer import event_buffer
+from app.services.export import iter_answers_csv
+from app.services.markdown_cache import markdown_renderer
+from app.services.research_export import research_export_cache
+from app.services.session_activity import activity_buffer
 from app.logging_config import log_admin_access
 
 from app.main import templates
@@ -21,7 +44,7 @@ router = APIRouter(
 @router.get("/", response_class=HTMLResponse)
 async def admin_dashboard(
     request: Request,
-    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    db_session: Annotated[AsyncSession, Depends(get_analytics_session)],
     admin_user: Annotated[str, Depends(get_admin_user)],
 ):
     """Comprehensive admin dashboard with all statistics."""
@@ -34,8 +57,10 @@ async def admin_dashboard(
         user_agent=request.headers.get("user-agent"),
     )
 
-    # Get all dashboard statistics
-    stats = await analytics.get_new_dashboard_stats(db_session)
+    # Get all dashboard statistics (shared by concurrent and repeated views)
+    stats = await dashboard_cache.get(
+        lambda: analytics.get_new_dashboard_stats(db_session)
+    )
 
     return templates.TemplateResponse(
         request,
@@ -45,5 +70,153 @@ async def admin_dashboard(
             "selfeval_stats": stats["selfeval_stats"],
             "exhibition_feedback_stats": stats["exhibition_feedback_stats"],
             "exhibit_question_stats": stats["exhibit_question_stats"],
+            "snapshot_age": analytics_snapshot.age_seconds(),
         },
     )
+
+
+@router.get("/export.csv")
+async def export_csv(
+    request: Request,
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    admin_user: Annotated[str, Depends(get_admin_user)],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Stream all exhibit answers as CSV, optionally limited to [since, until)."""
+    log_admin_access(
+        username=admin_user,
+        action="export_csv",
+        ip_address=request.client.host if request.client else None,
+        since=since.isoformat() if since else None,
+        until=until.isoformat() if until else None,
+    )
+
+    return StreamingResponse(
+        iter_answers_csv(db_session.bind, since, until),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="answers.csv"'},
+    )
+
+
+@router.get("/changes.ndjson")
+async def changes_feed(
+    request: Request,
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    admin_user: Annotated[str, Depends(get_admin_user)],
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=10_000)] = CDC_PAGE_SIZE,
+):
+    """
+    Sessions, feedback and answers changed since cursor, as NDJSON.
+
+    The cursor to resume from is in the X-CDC-Cursor header and the last
+    line; X-CDC-Has-More tells whether to fetch the next page right away.
+    """
+    try:
+        start = CdcCursor.decode(cursor)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    page = await plan_page(db_session, start, limit)
+    log_admin_access(
+        username=admin_user,
+        action="changes_feed",
+        level="DEBUG",
+        ip_address=request.client.host if request.client else None,
+        answer_id=start.answer_id,
+    )
+
+    return StreamingResponse(
+        iter_changes_ndjson(db_session.bind, page),
+        media_type="application/x-ndjson",
+        headers={
+            "X-CDC-Cursor": page.end.encode(),
+            "X-CDC-Has-More": "true" if page.has_more else "false",
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/export/research.zip")
+async def export_research_bundle(
+    request: Request,
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    admin_user: Annotated[str, Depends(get_admin_user)],
+    format: Annotated[str, Query(pattern="^(parquet|arrow)$")] = "parquet",
+):
+    """Columnar bundle (sessions, answers, feedback) for analysis in pandas."""
+    log_admin_access(
+        username=admin_user,
+        action="export_research",
+        ip_address=request.client.host if request.client else None,
+        format=format,
+    )
+
+    try:
+        path = await research_export_cache.get(db_session, format)
+    except ImportError as exc:
+        # pandas needs pyarrow to write Parquet/Arrow files
+        raise HTTPException(status_code=501, detail=f"Export unavailable: {exc}")
+
+    return FileResponse(
+        path,
+        media_type="application/zip",
+        filename=f"gallery_research_{format}.zip",
+    )
+
+
+@router.post("/content/reload")
+async def reload_content(
+    request: Request,
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+    admin_user: Annotated[str, Depends(get_admin_user)],
+):
+    """
+    Reload exhibit YAML and config files now, without a restart.
+
+    Changed files are re-synced and the content registry is swapped in as a
+    whole; on failure the current content stays active.
+    """
+    log_admin_access(
+        username=admin_user,
+        action="reload_content",
+        ip_address=request.client.host if request.client else None,
+    )
+
+    try:
+        report = await content_reloader.reload(force=True, bind=db_session.bind)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Content reload failed: {exc}")
+    config = await asyncio.to_thread(config_registry.revalidate)
+
+    return {
+        "content": report.summary(),
+        "exhibits": len(get_content_registry()),
+        "config_reloaded": config,
+    }
+
+
+@router.get("/metrics")
+async def admin_metrics():
+    """Runtime performance counters (caches, buffers, middleware fast path)."""
+    return {
+        "middleware": middleware_metrics.snapshot(),
+        "slug_cache": slug_cache.stats(),
+        "session_activity": {"pending": len(activity_buffer)},
+        "event_buffer": event_buffer.stats(),
+        "write_queue": write_queue.snapshot(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "parallel_reader": parallel_reader.snapshot(),
+        "analytics_snapshot": analytics_snapshot.stats(),
+        "research_export": research_export_cache.stats(),
+        "config_registry": config_registry.stats(),
+        "markdown": markdown_renderer.stats(),
+        "content_bundle": content_bundle.stats(),
+        "content_reload": content_reloader.stats(),
+        "content_sync": (
+            content_loader.last_sync_report.summary()
+            if content_loader.last_sync_report is not None
+            else None
+        ),
+    }
@@ -1,15 +1,28 @@
-from typing import Annotated, Optional, Tuple
+from datetime import datetime, timezone
+import uuid
+from typing import Annotated, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy import select
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from starlette.status import HTTP_404_NOT_FOUND
 
-from app.dependencies import get_csrf_token, track_session, verify_csrf_token
-from app.models import Answer, Exhibit, Question, Session
+from app.db import WriteUnit, write_queue
+from app.dependencies import (
+    get_csrf_token,
+    mark_exhibit_answered,
+    track_session,
+    track_session_view,
+    verify_csrf_token,
+)
+from app.models import Answer, Question, QuestionType, Session
 from app.logging_config import log_session_event, log_answer_submission, logger
+from app.schemas import EventCreate
+from app.session_cookie import SessionCookie
 
 from app.main import templates
 
@@ -17,18 +30,192 @@ router = APIRouter()
 
 from app.services.selfeval_loader import SelfEvalConfig
 from app.services.exhibition_feedback_loader import ExhibitionFeedbackConfig
+from app.services.content_registry import get_content_registry
+from app.services import rollups
+from app.services.dashboard_cache import dashboard_cache
+from app.services.event_buffer import buffered_events, event_buffer
 from app.services.exhibit_order import (
     get_exhibit_slug_by_index,
+    get_first_unanswered_slug,
     get_next_exhibit_slug,
     get_previous_exhibit_slug,
+    get_progress_bit,
     get_total_exhibits,
 )
 
 
+def answered_exhibit_stmt(session_id: int, exhibit_id: int):
+    """
+    Query for whether a session has answered an exhibit's questions.
+
+    Selects only Answer.id so SQLite answers it from uq_answers_session_question
+    and ix_questions_exhibit_id without touching table rows.
+    """
+    return (
+        select(Answer.id)
+        .join(Question)
+        .where(Answer.session_id == session_id, Question.exhibit_id == exhibit_id)
+        .limit(1)
+    )
+
+
+async def _has_answered(
+    db_session: AsyncSession, session: Session, exhibit, exhibit_order: list
+) -> bool:
+    """
+    Check the session's progress bitmap; exhibits outside the session's order
+    (e.g. added after the session started) fall back to the answers query.
+    """
+    bit = get_progress_bit(exhibit_order, exhibit.slug)
+    if bit:
+        return bool(session.progress_mask & bit)
+    result = await db_session.execute(answered_exhibit_stmt(session.id, exhibit.id))
+    return result.first() is not None
+
+
+def _selfeval_unit(session_id: int, selfeval: dict) -> WriteUnit:
+    """Write unit storing a session's selfeval and updating the rollups."""
+
+    async def unit(db_session: AsyncSession) -> None:
+        await rollups.record_selfeval(db_session, session_id, selfeval)
+        table = Session.__table__
+        await db_session.execute(
+            update(table)
+            .where(table.c.id == session_id)
+            .values(selfeval_json=selfeval, last_activity=datetime.now(timezone.utc))
+        )
+
+    return unit
+
+
+def _save_feedback_unit(session_id: int, feedback: dict) -> WriteUnit:
+    """
+    Write unit storing a session's exhibition feedback unless it already has
+    some; returns whether it was stored (and counted in the rollups).
+    """
+
+    async def unit(db_session: AsyncSession) -> bool:
+        table = Session.__table__
+        column = table.c.exhibition_feedback_json
+        result = await db_session.execute(
+            update(table)
+            .where(
+                table.c.id == session_id,
+                or_(
+                    func.ifnull(func.json_type(column), "null") == "null",
+                    func.json(column) == "{}",
+                ),
+            )
+            .values(
+                exhibition_feedback_json=feedback,
+                last_activity=datetime.now(timezone.utc),
+            )
+            .returning(table.c.created_at)
+        )
+        created_at = result.scalar_one_or_none()
+        if created_at is None:
+            return False
+        await rollups.record_feedback(db_session, rollups.session_day(created_at), feedback)
+        return True
+
+    return unit
+
+
+def _save_answers_unit(
+    session_id: int,
+    exhibit_id: int,
+    values: dict,
+    option_question_ids: set,
+    progress_bit: int,
+    mark_completed: bool,
+) -> WriteUnit:
+    """
+    Write unit inserting one exhibit's answers, setting its progress bit,
+    updating the rollups and (after the last exhibit) completing the session,
+    all in one transaction.
+
+    Answers go in as a single INSERT ... ON CONFLICT DO NOTHING against
+    uq_answers_session_question; the unit returns the number of rows actually
+    inserted (0 = the exhibit was already answered).
+    """
+
+    async def unit(db_session: AsyncSession) -> int:
+        table = Session.__table__
+        row = (
+            await db_session.execute(
+                select(
+                    table.c.progress_mask, table.c.created_at, table.c.selfeval_json
+                ).where(table.c.id == session_id)
+            )
+        ).one()
+        bit_was_set = bool(progress_bit and row.progress_mask & progress_bit)
+        if progress_bit:
+            first_for_exhibit = not bit_was_set
+        else:
+            answered = await db_session.execute(answered_exhibit_stmt(session_id, exhibit_id))
+            first_for_exhibit = answered.first() is None
+
+        inserted = []
+        if values:
+            now = datetime.now(timezone.utc)
+            answers = Answer.__table__
+            stmt = (
+                sqlite_insert(answers)
+                .values(
+                    [
+                        {
+                            "session_id": session_id,
+                            "question_id": question_id,
+                            "value_json": value,
+                            "created_at": now,
+                        }
+                        for question_id, value in values.items()
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=["session_id", "question_id"])
+                .returning(answers.c.question_id, answers.c.value_json)
+            )
+            inserted = [tuple(r) for r in await db_session.execute(stmt)]
+        if inserted:
+            await rollups.record_answers(
+                db_session,
+                day=rollups.session_day(row.created_at),
+                exhibit_id=exhibit_id,
+                answers=inserted,
+                option_question_ids=option_question_ids,
+                first_for_exhibit=first_for_exhibit,
+                progress_added=bool(progress_bit)
+                and not bit_was_set
+                and rollups.has_content(row.selfeval_json),
+            )
+
+        session_values = {}
+        if progress_bit and inserted:
+            # Evaluated against the row's current mask, so a bit set by a
+            # concurrent request is never counted twice
+            session_values["progress_mask"] = table.c.progress_mask.op("|")(progress_bit)
+            session_values["progress_count"] = table.c.progress_count + case(
+                (table.c.progress_mask.op("&")(progress_bit) == 0, 1), else_=0
+            )
+        if mark_completed:
+            session_values["completed"] = True
+        if session_values:
+            # Changed session rows are picked up by the CDC feed (app/services/cdc.py)
+            session_values["last_activity"] = datetime.now(timezone.utc)
+            await db_session.execute(
+                update(table).where(table.c.id == session_id).values(**session_values)
+            )
+        return len(inserted)
+
+    return unit
+
+
 @router.get("/", response_class=HTMLResponse)
 async def index(
     request: Request,
-    tracked_session: Annotated[Tuple[Session, AsyncSession], Depends(track_session)],
+    tracked_session: Annotated[
+        Tuple[Session | SessionCookie, AsyncSession], Depends(track_session_view)
+    ],
 ):
     """Intro page with link to start (selfeval)."""
     session, db_session = tracked_session
@@ -62,13 +249,16 @@ async def selfeval_get(
     # Ensure english-only flow: session.language is expected to be 'en'
 
     if session.selfeval_json:
-        # If self-evaluation is done, redirect to the first exhibit in randomized order
+        # If self-evaluation is done, resume at the first unanswered exhibit
+        # in randomized order (or the first one if all are answered)
         exhibit_order = (
             session.exhibit_order_json.get("order", [])
             if session.exhibit_order_json
             else []
         )
-        first_slug = get_exhibit_slug_by_index(exhibit_order, 0)
+        first_slug = get_first_unanswered_slug(
+            exhibit_order, session.progress_mask
+        ) or get_exhibit_slug_by_index(exhibit_order, 0)
         if first_slug:
             return RedirectResponse(url=f"/exhibit/{first_slug}", status_code=303)
         return RedirectResponse(url="/thanks", status_code=303)
@@ -91,9 +281,10 @@ async def selfeval_post(
 
     form = await request.form()
     # Store all form data as dict in selfeval_json
-    session.selfeval_json = dict(form)
-    db_session.add(session)
-    await db_session.commit()
+    selfeval = dict(form)
+    await write_queue.submit(_selfeval_unit(session.id, selfeval), db_session)
+    dashboard_cache.bump_generation()
+    set_committed_value(session, "selfeval_json", selfeval)
 
     # Log self-evaluation completion
     log_session_event(
@@ -120,22 +311,16 @@ async def selfeval_post(
 async def exhibit_detail(
     slug: str,
     request: Request,
-    tracked_session: Annotated[Tuple[Session, AsyncSession], Depends(track_session)],
+    tracked_session: Annotated[
+        Tuple[Session | SessionCookie, AsyncSession], Depends(track_session_view)
+    ],
 ):
     """Render exhibit content with basic navigation and forms."""
     session, db_session = tracked_session
     # english-only: no language guard
 
-    # Current exhibit with images/questions preloaded
-    result = await db_session.execute(
-        select(Exhibit)
-        .where(Exhibit.slug == slug)
-        .options(
-            selectinload(Exhibit.images),
-            selectinload(Exhibit.questions),
-        )
-    )
-    exhibit = result.scalars().first()
+    # Current exhibit with images/questions from the in-memory registry
+    exhibit = get_content_registry().get_exhibit(slug)
     if not exhibit:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Exhibit not found")
 
@@ -149,32 +334,24 @@ async def exhibit_detail(
         exhibit_title=exhibit.title,
     )
 
-    # Check if answers for this exhibit and session already exist
-    result = await db_session.execute(
-        select(Answer)
-        .join(Question)
-        .where(Answer.session_id == session.id, Question.exhibit_id == exhibit.id)
-    )
-    has_answered = result.scalars().first() is not None
-
-    # Get prev/next exhibits from randomized order
     exhibit_order = (
         session.exhibit_order_json.get("order", [])
         if session.exhibit_order_json
         else []
     )
+
+    # Check if answers for this exhibit and session already exist
+    if isinstance(session, SessionCookie):
+        has_answered = session.has_answered(slug)
+    else:
+        has_answered = await _has_answered(db_session, session, exhibit, exhibit_order)
+
+    # Get prev/next exhibits from randomized order
     prev_slug = get_previous_exhibit_slug(exhibit_order, slug)
     next_slug = get_next_exhibit_slug(exhibit_order, slug)
 
     csrf_token = get_csrf_token(session.uuid)
 
-    # Serialize images for Alpine.js
-    from app.schemas import ImageResponse
-
-    images_json = [
-        ImageResponse.model_validate(img).model_dump() for img in exhibit.images
-    ]
-
     return templates.TemplateResponse(
         request,
         "exhibit.html",
@@ -184,7 +361,7 @@ async def exhibit_detail(
             "prev_slug": prev_slug,
             "next_slug": next_slug,
             "csrf_token": csrf_token,
-            "images_json": images_json,
+            "images_json": exhibit.images_json,
         },
     )
 
@@ -192,13 +369,25 @@ async def exhibit_detail(
 @router.get("/thanks", response_class=HTMLResponse)
 async def thanks(
     request: Request,
-    tracked_session: Annotated[Tuple[Session, AsyncSession], Depends(track_session)],
+    tracked_session: Annotated[
+        Tuple[Session | SessionCookie, AsyncSession], Depends(track_session_view)
+    ],
 ):
     """Final page."""
     session, _ = tracked_session
     return templates.TemplateResponse(request, "thanks.html", {})
 
 
+def _already_answered_redirect(
+    request: Request, slug: str, next_slug: Optional[str]
+) -> RedirectResponse:
+    """Redirect a repeated submission to the next exhibit from randomized order."""
+    mark_exhibit_answered(request, slug)
+    if next_slug:
+        return RedirectResponse(url=f"/exhibit/{next_slug}", status_code=303)
+    return RedirectResponse(url="/exhibition-feedback", status_code=303)
+
+
 @router.post("/exhibit/{slug}/answer", dependencies=[Depends(verify_csrf_token)])
 async def save_answer(
     slug: str,
@@ -211,34 +400,24 @@ async def save_answer(
 
     form_data = await request.form()
 
-    # Fetch exhibit to get its ID
-    result = await db_session.execute(
-        select(Exhibit)
-        .where(Exhibit.slug == slug)
-        .options(selectinload(Exhibit.images), selectinload(Exhibit.questions))
-    )
-    exhibit = result.scalars().first()
+    # Look up exhibit (and its questions) in the in-memory registry
+    exhibit = get_content_registry().get_exhibit(slug)
     if not exhibit:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail="Exhibit not found")
 
-    # Check if answers for this exhibit and session already exist
-    result = await db_session.execute(
-        select(Answer)
-        .join(Question)
-        .where(Answer.session_id == session.id, Question.exhibit_id == exhibit.id)
+    exhibit_order = (
+        session.exhibit_order_json.get("order", [])
+        if session.exhibit_order_json
+        else []
     )
-    if result.scalars().first() is not None:
-        # Answers already submitted, redirect to next exhibit from randomized order
-        exhibit_order = (
-            session.exhibit_order_json.get("order", [])
-            if session.exhibit_order_json
-            else []
-        )
-        next_slug = get_next_exhibit_slug(exhibit_order, slug)
-        if next_slug:
-            return RedirectResponse(url=f"/exhibit/{next_slug}", status_code=303)
-        else:
-            return RedirectResponse(url="/exhibition-feedback", status_code=303)
+
+    next_slug = get_next_exhibit_slug(exhibit_order, slug)
+    progress_bit = get_progress_bit(exhibit_order, slug)
+
+    # Answered exhibits are known from the progress bitmap without a query;
+    # anything else is settled by the unique constraint on insert below
+    if progress_bit and session.progress_mask & progress_bit:
+        return _already_answered_redirect(request, slug, next_slug)
 
     questions = exhibit.questions
 
@@ -266,44 +445,17 @@ async def save_answer(
 
             if value_present:
                 answers[question.id] = value_to_save
-                new_answer = Answer(
-                    session_id=session.id,
-                    question_id=question.id,
-                    value_json=value_to_save,
-                )
-                db_session.add(new_answer)
-                # Log new answer
-                log_answer_submission(
-                    session_uuid=str(session.uuid),
-                    question_id=question.id,
-                    exhibit_slug=slug,
-                    action="created",
-                    question_text=question.text,
-                    question_type=question.type,
-                )
             elif question.required:
                 missing_required.append(question)
         elif question.required:
             missing_required.append(question)
 
     if missing_required:
-        # Get prev/next from randomized order for error display
-        exhibit_order = (
-            session.exhibit_order_json.get("order", [])
-            if session.exhibit_order_json
-            else []
-        )
+        # Get previous exhibit from randomized order for error display
         prev_slug = get_previous_exhibit_slug(exhibit_order, slug)
-        next_slug = get_next_exhibit_slug(exhibit_order, slug)
 
         csrf_token = get_csrf_token(session.uuid)
 
-        from app.schemas import ImageResponse
-
-        images_json = [
-            ImageResponse.model_validate(img).model_dump() for img in exhibit.images
-        ]
-
         error_msg = "Answer all mandatory questions: " + ", ".join(
             f"'{q.text}'" for q in missing_required
         )
@@ -329,13 +481,45 @@ async def save_answer(
                 "prev_slug": prev_slug,
                 "next_slug": next_slug,
                 "csrf_token": csrf_token,
-                "images_json": images_json,
+                "images_json": exhibit.images_json,
                 "error": error_msg,
             },
             status_code=400,
         )
 
-    await db_session.commit()
+    # Answers, progress bit and (after the last exhibit) completion go in one write
+    inserted = await write_queue.submit(
+        _save_answers_unit(
+            session.id,
+            exhibit.id,
+            answers,
+            {q.id for q in questions if q.type != QuestionType.TEXT},
+            progress_bit,
+            mark_completed=not next_slug,
+        ),
+        db_session,
+    )
+    if answers and not inserted:
+        # Every answer hit the unique constraint: a double submission
+        return _already_answered_redirect(request, slug, next_slug)
+    if inserted:
+        dashboard_cache.bump_generation()
+
+    if progress_bit and inserted and not session.progress_mask & progress_bit:
+        set_committed_value(session, "progress_mask", session.progress_mask | progress_bit)
+        set_committed_value(session, "progress_count", session.progress_count + 1)
+    mark_exhibit_answered(request, slug)
+
+    questions_by_id = {question.id: question for question in questions}
+    for question_id in answers:
+        log_answer_submission(
+            session_uuid=str(session.uuid),
+            question_id=question_id,
+            exhibit_slug=slug,
+            action="created",
+            question_text=questions_by_id[question_id].text,
+            question_type=questions_by_id[question_id].type,
+        )
 
     # Log successful form submission
     log_session_event(
@@ -347,21 +531,11 @@ async def save_answer(
         question_ids=list(answers.keys()),
     )
 
-    # Find next exhibit from randomized order
-    exhibit_order = (
-        session.exhibit_order_json.get("order", [])
-        if session.exhibit_order_json
-        else []
-    )
-    next_slug = get_next_exhibit_slug(exhibit_order, slug)
-
     if next_slug:
         return RedirectResponse(url=f"/exhibit/{next_slug}", status_code=303)
     else:
-        # This is the last exhibit, mark session as completed
-        session.completed = True
-        db_session.add(session)
-        await db_session.commit()
+        # This was the last exhibit, the session is now completed
+        set_committed_value(session, "completed", True)
 
         # Log session completion
         total_exhibits = get_total_exhibits(exhibit_order)
@@ -395,12 +569,9 @@ async def exhibition_feedback_get(
         level="DEBUG",
     )
 
-    # Load questions from YAML config
+    # Questions from YAML config, already sorted by sort_order
     questions = ExhibitionFeedbackConfig.get_questions()
 
-    # Sort questions by sort_order
-    questions = sorted(questions, key=lambda q: q.get("sort_order", 999))
-
     return templates.TemplateResponse(
         request,
         "exhibition_feedback.html",
@@ -493,9 +664,14 @@ async def submit_exhibition_feedback(
     feedback_data["submitted_at"] = session.last_activity.isoformat()
 
     # Store feedback in session
-    session.exhibition_feedback_json = feedback_data
-    db_session.add(session)
-    await db_session.commit()
+    saved = await write_queue.submit(
+        _save_feedback_unit(session.id, feedback_data), db_session
+    )
+    if not saved:
+        # Submitted concurrently (e.g. a double click) by another request
+        raise HTTPException(status_code=400, detail="Feedback already submitted")
+    dashboard_cache.bump_generation()
+    set_committed_value(session, "exhibition_feedback_json", feedback_data)
 
     # Log feedback submission
     log_session_event(
@@ -509,3 +685,42 @@ async def submit_exhibition_feedback(
     )
 
     return RedirectResponse(url="/thanks", status_code=303)
+
+
+# Beacon limits: a page sends a handful of events when it is hidden
+EVENT_BATCH_MAX_BYTES = 16 * 1024
+EVENT_BATCH_MAX_EVENTS = 50
+_event_batch = TypeAdapter(List[EventCreate])
+
+
+@router.post("/events", status_code=204)
+async def ingest_events(request: Request):
+    """
+    navigator.sendBeacon target: a JSON array of events for the current session.
+
+    Events are validated and buffered in memory (app/services/event_buffer.py);
+    no database work happens before the 204. Requests without a session
+    cookie are accepted and ignored.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > EVENT_BATCH_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Event batch too large")
+    body = await request.body()
+    if len(body) > EVENT_BATCH_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Event batch too large")
+
+    try:
+        # Single pass in pydantic-core, whatever the beacon's content type
+        events = _event_batch.validate_json(body)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid event batch")
+    if len(events) > EVENT_BATCH_MAX_EVENTS:
+        raise HTTPException(status_code=413, detail="Too many events")
+
+    try:
+        session_uuid = uuid.UUID(getattr(request.state, "session_id", None) or "")
+    except ValueError:
+        return Response(status_code=204)
+
+    event_buffer.append(buffered_events(session_uuid, events))
+    return Response(status_code=204)
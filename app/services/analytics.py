@@ -3,16 +3,55 @@ Efficient analytics services for Gallery Twin dashboard.
 
 - All calculations are performed at the database level using SQLAlchemy core/ORM queries.
 - Avoids loading large datasets into memory.
+- The dashboard itself reads the incrementally maintained rollup tables
+  (get_new_dashboard_stats); the raw queries below are their source of truth
+  (get_raw_dashboard_stats, rollups.rebuild_rollups).
 """
 
-import asyncio
 from typing import Any, Dict, List
 
-from sqlalchemy import Integer, func, select
+from sqlalchemy import Integer, func, literal, select, true, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.functions import coalesce
 
-from app.models import Answer, Event, EventType, Exhibit, Question, Session
+from app.db import parallel_reader
+from app.models import (
+    Answer,
+    AnswerOptionRollup,
+    DailyRollup,
+    Event,
+    EventType,
+    Exhibit,
+    ExhibitRollup,
+    FeedbackRollup,
+    Question,
+    QuestionType,
+    SelfevalRollup,
+    Session,
+)
+from app.services.exhibition_feedback_loader import ExhibitionFeedbackConfig
+
+# Selfeval form fields shown on the dashboard (ids from content/selfeval.yml)
+SELFEVAL_FIELDS = (
+    "gender",
+    "age",
+    "education",
+    "work_status",
+    "ai_fan",
+    "artist",
+    "art_field",
+    "ai_user",
+)
+
+
+def has_json_content(column) -> list:
+    """Where clauses matching a JSON column that holds a non-empty value."""
+    return [
+        column.is_not(None),
+        column != "null",
+        column != "{}",
+        column != "",
+    ]
 
 
 # ============================================================================
@@ -24,10 +63,7 @@ async def get_visitor_count(db_session: AsyncSession) -> int:
     """Count sessions with selfeval questionnaire filled (our definition of 'visitor')."""
     result = await db_session.execute(
         select(func.count(Session.id)).where(
-            Session.selfeval_json.is_not(None),
-            Session.selfeval_json != "null",
-            Session.selfeval_json != "{}",
-            Session.selfeval_json != "",
+            *has_json_content(Session.selfeval_json),
         )
     )
     return result.scalar_one()
@@ -47,10 +83,7 @@ async def get_visitors_over_time(db_session: AsyncSession) -> List[Dict[str, Any
             func.count(Session.id).label("visitor_count")
         )
         .where(
-            Session.selfeval_json.is_not(None),
-            Session.selfeval_json != "null",
-            Session.selfeval_json != "{}",
-            Session.selfeval_json != "",
+            *has_json_content(Session.selfeval_json),
         )
         .group_by(date_func)
         .order_by(date_func)
@@ -72,10 +105,7 @@ async def get_exhibition_feedback_percentage(db_session: AsyncSession) -> float:
 
     feedback_result = await db_session.execute(
         select(func.count(Session.id)).where(
-            Session.exhibition_feedback_json.is_not(None),
-            Session.exhibition_feedback_json != "null",
-            Session.exhibition_feedback_json != "{}",
-            Session.exhibition_feedback_json != "",
+            *has_json_content(Session.exhibition_feedback_json),
         )
     )
     feedback_count = feedback_result.scalar_one()
@@ -120,38 +150,22 @@ async def get_exhibit_completion_counts(db_session: AsyncSession) -> Dict[int, i
 async def get_avg_exhibits_per_visitor(db_session: AsyncSession) -> float:
     """Calculate average number of exhibits completed per visitor (out of 12 total).
 
-    An exhibit is "completed" if the visitor answered at least one question for it.
+    An exhibit is "completed" if the visitor answered at least one question for it,
+    as recorded in the denormalized Session.progress_count.
     """
     visitor_count = await get_visitor_count(db_session)
 
     if visitor_count == 0:
         return 0.0
 
-    # Count distinct exhibits answered per session (only for visitors)
-    stmt = (
-        select(
-            Answer.session_id,
-            func.count(func.distinct(Question.exhibit_id)).label("exhibits_answered")
-        )
-        .join(Question, Answer.question_id == Question.id)
-        .join(Session, Answer.session_id == Session.id)
-        .where(
-            Session.selfeval_json.is_not(None),
-            Session.selfeval_json != "null",
-            Session.selfeval_json != "{}",
-            Session.selfeval_json != "",
-            Question.exhibit_id.is_not(None)
+    result = await db_session.execute(
+        select(func.coalesce(func.sum(Session.progress_count), 0)).where(
+            *has_json_content(Session.selfeval_json),
         )
-        .group_by(Answer.session_id)
     )
+    exhibits_answered = result.scalar_one()
 
-    result = await db_session.execute(stmt)
-    exhibit_counts = [row.exhibits_answered for row in result]
-
-    if not exhibit_counts:
-        return 0.0
-
-    return round(sum(exhibit_counts) / visitor_count, 1)
+    return round(exhibits_answered / visitor_count, 1)
 
 
 # ============================================================================
@@ -163,23 +177,12 @@ async def get_detailed_selfeval_stats(db_session: AsyncSession) -> Dict[str, Any
     """Get comprehensive statistics from ALL self-evaluation form fields."""
     # Define all selfeval fields
     fields = {
-        "gender": func.json_extract(Session.selfeval_json, "$.gender"),
-        "age": func.json_extract(Session.selfeval_json, "$.age"),
-        "education": func.json_extract(Session.selfeval_json, "$.education"),
-        "work_status": func.json_extract(Session.selfeval_json, "$.work_status"),
-        "ai_fan": func.json_extract(Session.selfeval_json, "$.ai_fan"),
-        "artist": func.json_extract(Session.selfeval_json, "$.artist"),
-        "art_field": func.json_extract(Session.selfeval_json, "$.art_field"),
-        "ai_user": func.json_extract(Session.selfeval_json, "$.ai_user"),
+        field: func.json_extract(Session.selfeval_json, f"$.{field}")
+        for field in SELFEVAL_FIELDS
     }
 
     # Base where clause for valid selfeval
-    valid_selfeval_where = [
-        Session.selfeval_json.is_not(None),
-        Session.selfeval_json != "null",
-        Session.selfeval_json != "{}",
-        Session.selfeval_json != "",
-    ]
+    valid_selfeval_where = has_json_content(Session.selfeval_json)
 
     # Count total selfeval forms
     total_result = await db_session.execute(
@@ -193,31 +196,26 @@ async def get_detailed_selfeval_stats(db_session: AsyncSession) -> Dict[str, Any
             "fields": {},
         }
 
-    # Build queries for all fields
-    field_queries = {}
-    for field_name, field_key in fields.items():
-        field_queries[field_name] = select(
+    # One statement for all fields: a UNION ALL of per-field GROUP BYs
+    field_queries = [
+        select(
+            literal(field_name).label("field"),
             coalesce(field_key, "N/A").label("value"),
             func.count(Session.id).label("count")
         ).where(*valid_selfeval_where).group_by(coalesce(field_key, "N/A"))
-
-    # Execute all queries in parallel
-    results = await asyncio.gather(
-        *[db_session.execute(query) for query in field_queries.values()]
-    )
+        for field_name, field_key in fields.items()
+    ]
+    result = await db_session.execute(union_all(*field_queries))
 
     # Process results
-    field_stats = {}
-    for field_name, result in zip(field_queries.keys(), results):
-        counts = {row.value: row.count for row in result}
-        percentages = {
-            k: round((v / total_count) * 100, 1) for k, v in counts.items()
-        }
-
-        field_stats[field_name] = {
-            "counts": counts,
-            "percentages": percentages,
-        }
+    field_stats = {
+        field_name: {"counts": {}, "percentages": {}} for field_name in fields
+    }
+    for row in result:
+        field_stats[row.field]["counts"][row.value] = row.count
+        field_stats[row.field]["percentages"][row.value] = round(
+            (row.count / total_count) * 100, 1
+        )
 
     return {
         "total_selfeval": total_count,
@@ -230,16 +228,43 @@ async def get_detailed_selfeval_stats(db_session: AsyncSession) -> Dict[str, Any
 # ============================================================================
 
 
+def _build_feedback_catalog() -> Dict[str, Dict[str, Any]]:
+    """Group likert feedback questions from exhibition_feedback.yml by category.
+
+    Returns: {category_id: {"label": ..., "questions": {question_id: text}}}
+    Categories keep the order in which they are declared in YAML; questions
+    without a known category get their own group labelled by the category id.
+    """
+    catalog: Dict[str, Dict[str, Any]] = {
+        category["id"]: {"label": category.get("label", category["id"]), "questions": {}}
+        for category in ExhibitionFeedbackConfig.get_categories()
+        if category.get("id")
+    }
+
+    for question in ExhibitionFeedbackConfig.get_questions():
+        if question.get("type") != "likert":
+            continue
+        category_id = question.get("category", "other")
+        category = catalog.setdefault(
+            category_id, {"label": category_id.replace("_", " ").title(), "questions": {}}
+        )
+        category["questions"][question["id"]] = question["text"]
+
+    return {cid: data for cid, data in catalog.items() if data["questions"]}
+
+
 async def get_enhanced_exhibition_feedback_stats(db_session: AsyncSession) -> Dict[str, Any]:
-    """Get comprehensive exhibition feedback statistics for all 17 questions."""
+    """Get exhibition feedback statistics for all likert questions in exhibition_feedback.yml.
+
+    Distributions, counts and averages for every question are aggregated in a
+    single pass over ``json_each(exhibition_feedback_json)``.
+    """
+    # Base where clause for valid feedback
+    valid_feedback_where = has_json_content(Session.exhibition_feedback_json)
+
     # Count total feedback (filter out null strings)
     feedback_count_result = await db_session.execute(
-        select(func.count(Session.id)).where(
-            Session.exhibition_feedback_json.is_not(None),
-            Session.exhibition_feedback_json != "null",
-            Session.exhibition_feedback_json != "{}",
-            Session.exhibition_feedback_json != "",
-        )
+        select(func.count(Session.id)).where(*valid_feedback_where)
     )
     feedback_count = feedback_count_result.scalar_one()
 
@@ -249,96 +274,69 @@ async def get_enhanced_exhibition_feedback_stats(db_session: AsyncSession) -> Di
             "categories": {},
         }
 
-    # Define all 17 questions organized by category
-    questions = {
-        "cognitive": {
-            "label": "Cognitive Component",
-            "questions": {
-                "deep_thinking": "During the exhibition I felt an urge to reflect deeply.",
-                "absorbed_content": "During the exhibition I was absorbed/immersed in the content of the paintings.",
-                "new_information": "During the exhibition I acquired new information or insights.",
-                "new_thoughts": "During the exhibition I received stimuli for new ideas.",
-                "meaning_reflection": "During the exhibition I felt compelled to think about the meaning of the exhibited works.",
-                "new_questions": "During the exhibition I felt an urge to ask new questions.",
-            }
-        },
-        "emotions": {
-            "label": "Emotions",
-            "questions": {
-                "felt_calm": "During the exhibition I felt calm.",
-                "felt_good": "During the exhibition I felt good.",
-                "colors_vitality": "During the exhibition I had the impression that the colors and compositions evoked a sense of vitality in me.",
-                "positive_emotions": "During the exhibition I felt positive or pleasant emotions.",
-            }
-        },
-        "self_reflection": {
-            "label": "Self-Reflection",
-            "questions": {
-                "reconsider_life": "The exhibited paintings made me reconsider certain aspects of my personal life.",
-                "discover_self": "The exhibited paintings made me discover new aspects of myself.",
-                "personally_meaningful": "The exhibited paintings made me realize that they are personally meaningful to me.",
-                "common_identity": "The exhibited paintings made me realize that they have something in common with who I am.",
-            }
-        },
-        "ai_role": {
-            "label": "AI Future Role",
-            "questions": {
-                "ai_future_role": "What role do you think artificial intelligence could play in the future in creating original art?",
-            }
-        },
-        "more_exhibitions": {
-            "label": "Interest in Similar Exhibitions",
-            "questions": {
-                "more_exhibitions": "Would you like to see more exhibitions that combine traditional art and modern technologies such as AI?",
-            }
-        },
-        "attitude_change": {
-            "label": "Attitude Change",
-            "questions": {
-                "attitude_change": "Did the exhibition change your attitude toward the use of AI in artistic creation?",
-            }
-        },
-    }
+    catalog = _build_feedback_catalog()
+    question_ids = [qid for data in catalog.values() for qid in data["questions"]]
+    distributions = await get_feedback_rating_counts(db_session, question_ids)
+    return _format_feedback_stats(catalog, distributions, feedback_count)
 
-    # Base where clause for valid feedback
-    valid_feedback_where = [
-        Session.exhibition_feedback_json.is_not(None),
-        Session.exhibition_feedback_json != "null",
-        Session.exhibition_feedback_json != "{}",
-        Session.exhibition_feedback_json != "",
-    ]
 
-    # Build queries for all questions
-    category_stats = {}
+async def get_feedback_rating_counts(
+    db_session: AsyncSession, question_ids: List[str]
+) -> Dict[str, Dict[int, int]]:
+    """Rating histograms for the given feedback questions.
 
-    for category_id, category_data in questions.items():
+    Returns: {question_id: {rating: count}}
+    """
+    # One grouped query: (question, rating) -> count for every likert question
+    entries = func.json_each(Session.exhibition_feedback_json).table_valued(
+        "key", "value"
+    ).alias("entries")
+    rating = func.cast(entries.c.value, Integer)
+    stmt = (
+        select(
+            entries.c.key.label("question_id"),
+            rating.label("rating"),
+            func.count().label("count"),
+        )
+        .select_from(Session)
+        .join(entries, true())
+        .where(
+            *has_json_content(Session.exhibition_feedback_json),
+            entries.c.key.in_(question_ids),
+            entries.c.value.is_not(None),
+        )
+        .group_by(entries.c.key, rating)
+        .order_by(entries.c.key, rating)
+    )
+    result = await db_session.execute(stmt)
+
+    distributions: Dict[str, Dict[int, int]] = {qid: {} for qid in question_ids}
+    for row in result:
+        distributions[row.question_id][row.rating] = row.count
+    return distributions
+
+
+def _format_feedback_stats(
+    catalog: Dict[str, Dict[str, Any]],
+    distributions: Dict[str, Dict[int, int]],
+    feedback_count: int,
+) -> Dict[str, Any]:
+    """Shape rating histograms into the dashboard's per-category structure."""
+    category_stats = {}
+    for category_id, category_data in catalog.items():
         category_stats[category_id] = {
             "label": category_data["label"],
             "questions": {}
         }
 
         for question_id, question_text in category_data["questions"].items():
-            question_key = func.json_extract(
-                Session.exhibition_feedback_json, f"$.{question_id}"
-            )
-
-            # Get distribution (count per rating 1-5)
-            dist_result = await db_session.execute(
-                select(
-                    func.cast(question_key, Integer).label("rating"),
-                    func.count().label("count")
-                )
-                .where(*valid_feedback_where)
-                .group_by(func.cast(question_key, Integer))
-                .order_by(func.cast(question_key, Integer))
-            )
-            distribution = {row.rating: row.count for row in dist_result if row.rating is not None}
-
-            # Calculate average
-            avg_result = await db_session.execute(
-                select(func.avg(func.cast(question_key, Integer))).where(*valid_feedback_where)
+            distribution = distributions.get(question_id, {})
+            response_count = sum(distribution.values())
+            avg_rating = (
+                sum(r * c for r, c in distribution.items()) / response_count
+                if response_count
+                else None
             )
-            avg_rating = avg_result.scalar_one()
 
             # Calculate percentages
             percentages = {
@@ -349,6 +347,7 @@ async def get_enhanced_exhibition_feedback_stats(db_session: AsyncSession) -> Di
             category_stats[category_id]["questions"][question_id] = {
                 "text": question_text,
                 "avg": round(avg_rating, 2) if avg_rating else None,
+                "count": response_count,
                 "distribution": distribution,
                 "percentages": percentages,
             }
@@ -364,10 +363,75 @@ async def get_enhanced_exhibition_feedback_stats(db_session: AsyncSession) -> Di
 # ============================================================================
 
 
+def answer_option_values(value: Any) -> List[str]:
+    """Options chosen in a choice/likert answer (multi-choice values are lists)."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+async def get_answer_option_counts(db_session: AsyncSession) -> Dict[int, Dict[str, int]]:
+    """Count answers per option of the choice/likert exhibit questions.
+
+    Streams every such answer; the dashboard reads rollup_answer_options instead.
+
+    Returns: {question_id: {option: count}}
+    """
+    counts: Dict[int, Dict[str, int]] = {}
+    # Question ids first, so answers are read through ix_answers_question_session
+    question_ids = (
+        await db_session.execute(
+            select(Question.id).where(
+                Question.exhibit_id.is_not(None), Question.type != QuestionType.TEXT
+            )
+        )
+    ).scalars().all()
+    if not question_ids:
+        return counts
+    result = await db_session.stream(
+        select(Answer.question_id, Answer.value_json, Answer.value_text).where(
+            Answer.question_id.in_(question_ids)
+        )
+    )
+    async for question_id, value_json, value_text in result:
+        value = value_json if value_json is not None else value_text
+        if value is None:
+            continue
+        question_counts = counts.setdefault(question_id, {})
+        for option in answer_option_values(value):
+            question_counts[option] = question_counts.get(option, 0) + 1
+    return counts
+
+
+async def _add_option_counts(
+    db_session: AsyncSession,
+    exhibit_stats: List[Dict[str, Any]],
+    counts: Dict[int, Dict[str, int]],
+) -> None:
+    """Add the option counts of each exhibit's choice/likert questions."""
+    result = await db_session.execute(
+        select(Question.id, Question.exhibit_id, Question.text)
+        .where(Question.exhibit_id.is_not(None), Question.type != QuestionType.TEXT)
+        .order_by(Question.exhibit_id, Question.sort_order, Question.id)
+    )
+    questions: Dict[int, List[Dict[str, Any]]] = {}
+    for row in result:
+        questions.setdefault(row.exhibit_id, []).append(
+            {
+                "question_id": row.id,
+                "question_text": row.text,
+                "counts": dict(sorted(counts.get(row.id, {}).items())),
+            }
+        )
+    for exhibit in exhibit_stats:
+        exhibit["questions"] = questions.get(exhibit["exhibit_id"], [])
+
+
 async def get_exhibit_question_stats(db_session: AsyncSession) -> List[Dict[str, Any]]:
-    """Get simplified exhibit statistics: just exhibit info and session count.
+    """Get exhibit statistics: exhibit info, session count and option counts.
 
-    Returns list of exhibits with count of sessions that answered at least one question.
+    Returns list of exhibits with count of sessions that answered at least one
+    question and the answer counts per option of their choice/likert questions.
     """
     # Get all exhibits with session counts in one optimized query
     stmt = (
@@ -395,6 +459,7 @@ async def get_exhibit_question_stats(db_session: AsyncSession) -> List[Dict[str,
         }
         for row in result
     ]
+    await _add_option_counts(db_session, exhibit_stats, await get_answer_option_counts(db_session))
 
     return exhibit_stats
 
@@ -404,8 +469,12 @@ async def get_exhibit_question_stats(db_session: AsyncSession) -> List[Dict[str,
 # ============================================================================
 
 
-async def get_new_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
-    """Get all statistics for the new refactored admin dashboard.
+async def get_raw_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
+    """Compute the dashboard statistics directly from sessions/answers.
+
+    Cost grows with the number of visitors; the admin page uses
+    get_new_dashboard_stats (rollup tables) instead. Kept as the reference
+    implementation the rollups are checked against.
 
     Returns comprehensive stats in 4 main sections:
     1. Basic dashboard (KPIs)
@@ -413,7 +482,7 @@ async def get_new_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
     3. Exhibition feedback statistics
     4. Exhibit questionnaire statistics
     """
-    # Run all analytics in parallel for efficiency
+    # Run all analytics in parallel, each on its own read connection
     (
         visitor_count,
         visitors_over_time,
@@ -423,15 +492,16 @@ async def get_new_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
         selfeval_stats,
         exhibition_feedback_stats,
         exhibit_question_stats,
-    ) = await asyncio.gather(
-        get_visitor_count(db_session),
-        get_visitors_over_time(db_session),
-        get_exhibition_feedback_percentage(db_session),
-        get_total_exhibit_answers(db_session),
-        get_avg_exhibits_per_visitor(db_session),
-        get_detailed_selfeval_stats(db_session),
-        get_enhanced_exhibition_feedback_stats(db_session),
-        get_exhibit_question_stats(db_session),
+    ) = await parallel_reader.gather(
+        db_session,
+        get_visitor_count,
+        get_visitors_over_time,
+        get_exhibition_feedback_percentage,
+        get_total_exhibit_answers,
+        get_avg_exhibits_per_visitor,
+        get_detailed_selfeval_stats,
+        get_enhanced_exhibition_feedback_stats,
+        get_exhibit_question_stats,
     )
 
     return {
@@ -447,3 +517,131 @@ async def get_new_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
         "exhibition_feedback_stats": exhibition_feedback_stats,
         "exhibit_question_stats": exhibit_question_stats,
     }
+
+
+async def _read_daily_rollup(db_session: AsyncSession) -> List[Any]:
+    result = await db_session.execute(select(DailyRollup).order_by(DailyRollup.day))
+    return list(result.scalars())
+
+
+async def _read_selfeval_rollup(db_session: AsyncSession) -> List[Any]:
+    result = await db_session.execute(
+        select(SelfevalRollup)
+        .where(SelfevalRollup.count > 0)
+        .order_by(SelfevalRollup.field, SelfevalRollup.value)
+    )
+    return list(result.scalars())
+
+
+async def _read_feedback_rollup(db_session: AsyncSession) -> List[Any]:
+    result = await db_session.execute(
+        select(FeedbackRollup)
+        .where(FeedbackRollup.count > 0)
+        .order_by(FeedbackRollup.question_id, FeedbackRollup.rating)
+    )
+    return list(result.scalars())
+
+
+async def _read_exhibit_rollups(db_session: AsyncSession) -> List[Dict[str, Any]]:
+    result = await db_session.execute(
+        select(
+            Exhibit.id,
+            Exhibit.slug,
+            Exhibit.title,
+            func.coalesce(ExhibitRollup.sessions_answered, 0).label("sessions_answered"),
+        )
+        .outerjoin(ExhibitRollup, Exhibit.id == ExhibitRollup.exhibit_id)
+        .order_by(Exhibit.order_index)
+    )
+    exhibit_stats = [
+        {
+            "exhibit_id": row.id,
+            "exhibit_slug": row.slug,
+            "exhibit_title": row.title,
+            "sessions_answered": row.sessions_answered,
+        }
+        for row in result
+    ]
+    option_counts: Dict[int, Dict[str, int]] = {}
+    result = await db_session.execute(
+        select(AnswerOptionRollup).where(AnswerOptionRollup.count > 0)
+    )
+    for row in result.scalars():
+        option_counts.setdefault(row.question_id, {})[row.value] = row.count
+    await _add_option_counts(db_session, exhibit_stats, option_counts)
+    return exhibit_stats
+
+
+async def get_new_dashboard_stats(db_session: AsyncSession) -> Dict[str, Any]:
+    """Get all statistics for the new refactored admin dashboard.
+
+    Reads only the rollup tables (see app/services/rollups.py), so the cost
+    does not depend on the number of visitors; the rollup tables are read in
+    parallel, each on its own read connection. Same structure as
+    get_raw_dashboard_stats:
+    1. Basic dashboard (KPIs)
+    2. Selfeval statistics
+    3. Exhibition feedback statistics
+    4. Exhibit questionnaire statistics
+    """
+    daily_rows, selfeval_rows, feedback_rows, exhibit_question_stats = (
+        await parallel_reader.gather(
+            db_session,
+            _read_daily_rollup,
+            _read_selfeval_rollup,
+            _read_feedback_rollup,
+            _read_exhibit_rollups,
+        )
+    )
+    visitor_count = sum(row.visitors for row in daily_rows)
+    feedback_count = sum(row.feedback for row in daily_rows)
+    exhibits_answered = sum(row.exhibits_answered for row in daily_rows)
+
+    # Selfeval
+    selfeval_fields: Dict[str, Dict[str, Any]] = {}
+    if visitor_count:
+        for row in selfeval_rows:
+            if row.field not in SELFEVAL_FIELDS:
+                continue
+            field = selfeval_fields.setdefault(row.field, {"counts": {}, "percentages": {}})
+            field["counts"][row.value] = row.count
+            field["percentages"][row.value] = round((row.count / visitor_count) * 100, 1)
+        selfeval_fields = {
+            name: selfeval_fields[name] for name in SELFEVAL_FIELDS if name in selfeval_fields
+        }
+
+    # Exhibition feedback
+    exhibition_feedback_stats: Dict[str, Any] = {"total_feedback": 0, "categories": {}}
+    if feedback_count:
+        catalog = _build_feedback_catalog()
+        distributions: Dict[str, Dict[int, int]] = {
+            qid: {} for data in catalog.values() for qid in data["questions"]
+        }
+        for row in feedback_rows:
+            if row.question_id in distributions:
+                distributions[row.question_id][row.rating] = row.count
+        exhibition_feedback_stats = _format_feedback_stats(
+            catalog, distributions, feedback_count
+        )
+
+    return {
+        "basic_dashboard": {
+            "visitor_count": visitor_count,
+            "visitors_over_time": [
+                {"date": row.day, "count": row.visitors}
+                for row in daily_rows
+                if row.visitors > 0
+            ],
+            "total_exhibit_answers": sum(row.exhibit_answers for row in daily_rows),
+            "avg_exhibits_per_visitor": (
+                round(exhibits_answered / visitor_count, 1) if visitor_count else 0.0
+            ),
+            "feedback_count": feedback_count,
+            "feedback_percentage": (
+                round((feedback_count / visitor_count) * 100, 1) if visitor_count else 0.0
+            ),
+        },
+        "selfeval_stats": {"total_selfeval": visitor_count, "fields": selfeval_fields},
+        "exhibition_feedback_stats": exhibition_feedback_stats,
+        "exhibit_question_stats": exhibit_question_stats,
+    }
@@ -0,0 +1,210 @@
+"""
+Read-only snapshot of the live database for analytics.
+
+- A background task copies the live SQLite file every N seconds with the
+  online backup API, a few pages per step with short sleeps in between, so
+  the copy never monopolizes the disk or holds locks visitors' writes need
+- The copy is written to a temporary file and renamed into place, so readers
+  always see a complete snapshot
+- Admin analytics read the snapshot through a separate read-only engine
+  (get_analytics_session); the live database is used until a first snapshot
+  exists or when snapshots are disabled (ANALYTICS_SNAPSHOT_INTERVAL=0,
+  default 60 s)
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated, AsyncGenerator, Optional
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db import engine, get_async_session
+from app.logging_config import db_logger
+from app.services.dashboard_cache import dashboard_cache
+
+
+class _IncrementalBackupTooSlow(Exception):
+    pass
+
+
+def default_snapshot_path(database_path: Optional[str]) -> Optional[str]:
+    """gallery.db -> gallery.snapshot.db next to the live database."""
+    if not database_path or database_path == ":memory:":
+        return None
+    path = Path(database_path)
+    return str(path.with_name(f"{path.stem}.snapshot{path.suffix or '.db'}"))
+
+
+class AnalyticsSnapshot:
+    """
+    Periodically refreshed read-only copy of the live database.
+
+    Args:
+        source_path: Live SQLite database file.
+        snapshot_path: Where the snapshot is kept.
+        interval: Seconds between refreshes (0 = disabled).
+        pages: Pages copied per backup step.
+        step_sleep: Seconds to sleep between backup steps.
+        max_incremental_seconds: A backup restarts whenever another connection
+            writes to the source, so under constant writes an incremental copy
+            may never finish. Past this bound the copy is finished in a single
+            step instead (a WAL read transaction, writers are not blocked).
+    """
+
+    def __init__(
+        self,
+        source_path: Optional[str],
+        snapshot_path: Optional[str],
+        interval: float = 0,
+        pages: int = 256,
+        step_sleep: float = 0.005,
+        max_incremental_seconds: float = 30.0,
+    ):
+        self.source_path = source_path
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.pages = pages
+        self.step_sleep = step_sleep
+        self.max_incremental_seconds = max_incremental_seconds
+        self.refreshed_at: Optional[datetime] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.single_step_fallbacks = 0
+        self.last_duration = 0.0
+        self._engine: Optional[AsyncEngine] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0 and bool(self.source_path) and bool(self.snapshot_path)
+
+    @property
+    def ready(self) -> bool:
+        """True once a snapshot has been taken by this process."""
+        return self._engine is not None
+
+    def age_seconds(self) -> Optional[float]:
+        if self.refreshed_at is None:
+            return None
+        return (datetime.now(timezone.utc) - self.refreshed_at).total_seconds()
+
+    def session(self) -> AsyncSession:
+        return AsyncSession(self._engine, expire_on_commit=False)
+
+    def _copy(self) -> None:
+        """Back up the source into a temporary file and rename it into place."""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        source = sqlite3.connect(self.source_path)
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.execute("PRAGMA busy_timeout=5000")
+            started = time.monotonic()
+
+            def progress(status, remaining, total):
+                if time.monotonic() - started > self.max_incremental_seconds:
+                    raise _IncrementalBackupTooSlow()
+
+            try:
+                source.backup(
+                    target, pages=self.pages, progress=progress, sleep=self.step_sleep
+                )
+            except _IncrementalBackupTooSlow:
+                self.single_step_fallbacks += 1
+                source.backup(target)
+            # Standalone file: no -wal/-shm needed to open it read-only
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def refresh(self) -> None:
+        """Take a new snapshot (blocking work runs in a worker thread)."""
+        started = time.monotonic()
+        await asyncio.to_thread(self._copy)
+        self.last_duration = time.monotonic() - started
+        self.refreshed_at = datetime.now(timezone.utc)
+        self.refreshes += 1
+        if self._engine is None:
+            # NullPool: every session opens the file anew, so connections
+            # never keep reading a snapshot that has been replaced
+            self._engine = create_async_engine(
+                f"sqlite+aiosqlite:///file:{self.snapshot_path}?mode=ro&immutable=1&uri=true",
+                poolclass=NullPool,
+            )
+        # Cached dashboard results may predate the new snapshot
+        dashboard_cache.bump_generation()
+        db_logger.debug(
+            f"Analytics snapshot refreshed in {self.last_duration * 1000:.0f} ms"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as exc:
+                self.failures += 1
+                db_logger.error(f"Analytics snapshot refresh failed: {exc}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresh task (call from app lifespan)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    def stats(self) -> dict:
+        age = self.age_seconds()
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "age_s": round(age, 1) if age is not None else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "single_step_fallbacks": self.single_step_fallbacks,
+            "last_duration_ms": round(self.last_duration * 1000, 1),
+        }
+
+
+analytics_snapshot = AnalyticsSnapshot(
+    source_path=engine.url.database,
+    snapshot_path=os.getenv("ANALYTICS_SNAPSHOT_PATH")
+    or default_snapshot_path(engine.url.database),
+    interval=float(os.getenv("ANALYTICS_SNAPSHOT_INTERVAL", "60")),
+    pages=int(os.getenv("ANALYTICS_SNAPSHOT_PAGES", "256")),
+    step_sleep=float(os.getenv("ANALYTICS_SNAPSHOT_STEP_SLEEP_MS", "5")) / 1000,
+)
+
+
+async def get_analytics_session(
+    db_session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for analytics reads: the snapshot when one is available,
+    otherwise the live database session.
+    """
+    if not analytics_snapshot.ready:
+        yield db_session
+        return
+    async with analytics_snapshot.session() as session:
+        yield session
@@ -0,0 +1,291 @@
+"""
+Change-data-capture feed: NDJSON of sessions, answers and feedback changed
+since a cursor, for mirroring results into a warehouse.
+
+- Answers are insert-only, so Answer.id is their change sequence
+- Sessions change in place; every visitor write stamps last_activity, so
+  (last_activity, id) orders session changes (ix_sessions_last_activity_id)
+- Feedback is emitted with its session (set once, part of the session row)
+- Pages are keyset ranges: the upper bounds are looked up first (index-only),
+  so the resume cursor is known before the body and sent as a header; it is
+  also the last NDJSON line
+- Delivery is at-least-once: a session changed again is emitted again, so
+  consumers upsert by uuid (sessions, feedback) and id (answers)
+
+last_activity is also refreshed by the write-behind activity buffer with the
+time of the request, up to a flush interval after the fact. Session changes
+are therefore only handed out up to a watermark CDC_SESSION_LAG seconds in
+the past, so a late flush can never land behind a cursor already returned.
+"""
+
+import base64
+import binascii
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models import Answer, Exhibit, Question, Session
+from app.services.analytics import has_json_content
+
+CDC_CURSOR_VERSION = 1
+CDC_PAGE_SIZE = 1000
+CDC_SESSION_LAG = float(os.getenv("CDC_SESSION_LAG", "30"))
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass(frozen=True)
+class CdcCursor:
+    """Position in the feed: last answer id, last (last_activity, id) of sessions."""
+
+    answer_id: int = 0
+    session_ts: datetime = _EPOCH
+    session_id: int = 0
+
+    def encode(self) -> str:
+        payload = {
+            "v": CDC_CURSOR_VERSION,
+            "a": self.answer_id,
+            "t": self.session_ts.isoformat(),
+            "s": self.session_id,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: Optional[str]) -> "CdcCursor":
+        """Parse a cursor returned by the feed (None or '' = from the start)."""
+        if not token:
+            return cls()
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            version = payload.get("v")
+            cursor = cls(
+                answer_id=int(payload["a"]),
+                session_ts=_as_naive_utc(datetime.fromisoformat(payload["t"])),
+                session_id=int(payload["s"]),
+            )
+        except (binascii.Error, AttributeError, KeyError, TypeError, ValueError) as exc:
+            # ValueError covers JSON and unicode decoding errors
+            raise InvalidCursor("Malformed cursor") from exc
+        if version != CDC_CURSOR_VERSION:
+            raise InvalidCursor("Unsupported cursor version")
+        return cursor
+
+
+@dataclass(frozen=True)
+class CdcPage:
+    """One page of the feed: rows after `start` up to and including `end`."""
+
+    start: CdcCursor
+    end: CdcCursor
+    has_more: bool
+
+
+def _session_key():
+    table = Session.__table__
+    return tuple_(table.c.last_activity, table.c.id)
+
+
+async def plan_page(
+    db_session: AsyncSession,
+    cursor: CdcCursor,
+    limit: int = CDC_PAGE_SIZE,
+    now: Optional[datetime] = None,
+    session_lag: float = CDC_SESSION_LAG,
+) -> CdcPage:
+    """
+    Find the upper bounds of the next page (up to limit answers and limit
+    sessions) without reading the rows themselves.
+    """
+    answers = Answer.__table__
+    sessions = Session.__table__
+    now = _as_naive_utc(now or datetime.now(timezone.utc))
+    watermark = now - timedelta(seconds=session_lag)
+
+    answer_ids = (
+        select(answers.c.id)
+        .where(answers.c.id > cursor.answer_id)
+        .order_by(answers.c.id)
+        .limit(limit)
+        .subquery()
+    )
+    answer_count, answer_end = (
+        await db_session.execute(select(func.count(), func.max(answer_ids.c.id)))
+    ).one()
+
+    session_keys = (
+        select(sessions.c.last_activity, sessions.c.id)
+        .where(
+            _session_key() > tuple_(cursor.session_ts, cursor.session_id),
+            sessions.c.last_activity <= watermark,
+        )
+        .order_by(sessions.c.last_activity, sessions.c.id)
+        .limit(limit)
+        .subquery()
+    )
+    session_count = (await db_session.execute(select(func.count()).select_from(session_keys))).scalar_one()
+    session_end = (
+        await db_session.execute(
+            select(session_keys.c.last_activity, session_keys.c.id)
+            .order_by(session_keys.c.last_activity.desc(), session_keys.c.id.desc())
+            .limit(1)
+        )
+    ).one_or_none()
+
+    end = CdcCursor(
+        answer_id=answer_end if answer_count else cursor.answer_id,
+        session_ts=_as_naive_utc(session_end[0]) if session_end else cursor.session_ts,
+        session_id=session_end[1] if session_end else cursor.session_id,
+    )
+    return CdcPage(
+        start=cursor,
+        end=end,
+        has_more=answer_count == limit or session_count == limit,
+    )
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _json_or_none(value: Any) -> Any:
+    return value if isinstance(value, (dict, list)) and value else None
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+async def iter_changes_ndjson(
+    bind: AsyncEngine, page: CdcPage, chunk_size: int = 500
+) -> AsyncIterator[str]:
+    """
+    Yield the page as NDJSON chunks: session, feedback and answer records,
+    then a final {"type": "cursor"} line.
+
+    Rows are read through server-side cursors in chunks; each chunk is only
+    fetched after the previous one has been sent (the response awaits the
+    client), so a slow consumer holds back the reads instead of buffering.
+    """
+    sessions = Session.__table__
+    answers = Answer.__table__
+    questions = Question.__table__
+    exhibits = Exhibit.__table__
+    start, end = page.start, page.end
+    session_range = (
+        _session_key() > tuple_(start.session_ts, start.session_id),
+        _session_key() <= tuple_(end.session_ts, end.session_id),
+    )
+
+    async with AsyncSession(bind) as db_session:
+        if (end.session_ts, end.session_id) != (start.session_ts, start.session_id):
+            result = await db_session.stream(
+                select(
+                    sessions.c.id,
+                    sessions.c.uuid,
+                    sessions.c.created_at,
+                    sessions.c.last_activity,
+                    sessions.c.completed,
+                    sessions.c.progress_count,
+                    sessions.c.selfeval_json,
+                )
+                .where(*session_range)
+                .order_by(sessions.c.last_activity, sessions.c.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for partition in result.partitions(chunk_size):
+                yield "".join(
+                    _line(
+                        {
+                            "type": "session",
+                            "id": row.id,
+                            "uuid": str(row.uuid),
+                            "created_at": _iso(row.created_at),
+                            "last_activity": _iso(row.last_activity),
+                            "completed": row.completed,
+                            "progress_count": row.progress_count,
+                            "selfeval": _json_or_none(row.selfeval_json),
+                        }
+                    )
+                    for row in partition
+                )
+
+            result = await db_session.stream(
+                select(
+                    sessions.c.uuid,
+                    sessions.c.last_activity,
+                    sessions.c.exhibition_feedback_json,
+                )
+                .where(*session_range, *has_json_content(sessions.c.exhibition_feedback_json))
+                .order_by(sessions.c.last_activity, sessions.c.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for partition in result.partitions(chunk_size):
+                yield "".join(
+                    _line(
+                        {
+                            "type": "feedback",
+                            "session_uuid": str(row.uuid),
+                            "last_activity": _iso(row.last_activity),
+                            "feedback": row.exhibition_feedback_json,
+                        }
+                    )
+                    for row in partition
+                )
+
+        if end.answer_id != start.answer_id:
+            result = await db_session.stream(
+                select(
+                    answers.c.id,
+                    sessions.c.uuid,
+                    answers.c.created_at,
+                    exhibits.c.slug,
+                    answers.c.question_id,
+                    answers.c.value_json,
+                    answers.c.value_text,
+                )
+                .select_from(answers)
+                .join(sessions, answers.c.session_id == sessions.c.id)
+                .join(questions, answers.c.question_id == questions.c.id)
+                .outerjoin(exhibits, questions.c.exhibit_id == exhibits.c.id)
+                .where(answers.c.id > start.answer_id, answers.c.id <= end.answer_id)
+                .order_by(answers.c.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for partition in result.partitions(chunk_size):
+                yield "".join(
+                    _line(
+                        {
+                            "type": "answer",
+                            "id": row.id,
+                            "session_uuid": str(row.uuid),
+                            "created_at": _iso(row.created_at),
+                            "exhibit_slug": row.slug,
+                            "question_id": row.question_id,
+                            "value": (
+                                row.value_json if row.value_json is not None else row.value_text
+                            ),
+                        }
+                    )
+                    for row in partition
+                )
+
+    yield _line({"type": "cursor", "cursor": end.encode(), "has_more": page.has_more})
@@ -0,0 +1,210 @@
+"""
+Registry of parsed YAML configuration files (feedback, selfeval, site copy).
+
+- Each file is parsed once into immutable structures (mappings become
+  read-only MappingProxyType, lists become tuples) and post-processed once
+  (e.g. feedback questions pre-sorted by sort_order); request handlers only
+  read the prepared value
+- A background task revalidates the files every CONFIG_RELOAD_INTERVAL
+  seconds: a changed mtime/size triggers a read, and a changed SHA-256 of the
+  content a re-parse (served from the compiled content bundle when the
+  content is in it). Nothing is checked per request
+- A file that fails to parse keeps the previous value (or the fallback when
+  there is none) and is counted in stats()
+- Listeners are called with the new value after every (re)load, e.g. to
+  update a Jinja global
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.logging_config import logger
+from app.services.content_bundle import load_yaml
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ConfigEntry:
+    """One registered file: its current value and the stat/hash it came from."""
+
+    __slots__ = (
+        "name", "path", "build", "fallback", "listeners", "value", "stat",
+        "digest", "loads", "errors", "last_load_ms", "loaded_at",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        build: Callable[[Dict[str, Any]], Any],
+        fallback: Callable[[], Dict[str, Any]],
+    ):
+        self.name = name
+        self.path = path
+        self.build = build
+        self.fallback = fallback
+        self.listeners: List[Callable[[Any], None]] = []
+        self.value: Any = None
+        self.stat: Optional[Tuple[int, int]] = None
+        self.digest: Optional[str] = None
+        self.loads = 0
+        self.errors = 0
+        self.last_load_ms = 0.0
+        self.loaded_at: Optional[float] = None
+
+
+class ConfigRegistry:
+    """
+    Parsed configuration files, revalidated in the background.
+
+    Args:
+        interval: Seconds between revalidations (0 = load once, never reload).
+    """
+
+    def __init__(self, interval: float = 10.0):
+        self.interval = interval
+        self.revalidations = 0
+        self._entries: Dict[str, ConfigEntry] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        path: str,
+        build: Callable[[Dict[str, Any]], Any] = freeze,
+        fallback: Callable[[], Dict[str, Any]] = dict,
+    ) -> None:
+        """
+        Register a YAML file; build turns the parsed document into the value
+        served by get(), fallback gives the document used when the file is
+        missing.
+        """
+        self._entries[name] = ConfigEntry(name, Path(path), build, fallback)
+
+    def add_listener(self, name: str, listener: Callable[[Any], None]) -> None:
+        """Call listener with the value now and after every reload."""
+        value = self.get(name)
+        self._entries[name].listeners.append(listener)
+        listener(value)
+
+    def get(self, name: str) -> Any:
+        """Current value of a config file (loaded on first use)."""
+        entry = self._entries[name]
+        if entry.loaded_at is None:
+            self._revalidate(entry)
+        return entry.value
+
+    def _load(
+        self, entry: ConfigEntry, document: Dict[str, Any], digest: Optional[str], started: float
+    ) -> None:
+        value = entry.build(document)
+        entry.value = value
+        entry.digest = digest
+        entry.loads += 1
+        # Reading, hashing, parsing and building
+        entry.last_load_ms = (time.perf_counter() - started) * 1000
+        entry.loaded_at = time.time()
+        for listener in entry.listeners:
+            listener(value)
+
+    def _revalidate(self, entry: ConfigEntry) -> bool:
+        """Reload entry if its file changed; returns True when it was reloaded."""
+        started = time.perf_counter()
+        try:
+            stat = entry.path.stat()
+        except FileNotFoundError:
+            if entry.loaded_at is not None and entry.stat is None:
+                return False
+            entry.stat = None
+            self._load(entry, entry.fallback(), None, started)
+            return True
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        if entry.loaded_at is not None and key == entry.stat:
+            return False
+
+        try:
+            raw = entry.path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry.loaded_at is not None and digest == entry.digest:
+                # Touched but unchanged
+                entry.stat = key
+                return False
+            document = load_yaml(raw, digest) or {}
+            if not isinstance(document, dict):
+                raise ValueError("top level must be a mapping")
+            self._load(entry, document, digest, started)
+        except Exception as exc:
+            entry.errors += 1
+            # Do not retry the same broken file on every tick
+            entry.stat = key
+            logger.error(f"Failed to load config {entry.path}: {exc}")
+            if entry.loaded_at is None:
+                self._load(entry, {}, None, started)
+            return False
+        entry.stat = key
+        logger.debug(f"Config {entry.name} loaded in {entry.last_load_ms:.1f} ms")
+        return True
+
+    def revalidate(self) -> List[str]:
+        """Check all files once; returns the names of the reloaded ones."""
+        self.revalidations += 1
+        return [name for name, entry in self._entries.items() if self._revalidate(entry)]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                reloaded = await asyncio.to_thread(self.revalidate)
+            except Exception as exc:
+                logger.error(f"Config revalidation failed: {exc}")
+                continue
+            if reloaded:
+                logger.info(f"Reloaded config: {', '.join(reloaded)}")
+
+    def start(self) -> None:
+        """Load every file and start background revalidation (app lifespan)."""
+        for name in self._entries:
+            self.get(name)
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "revalidations": self.revalidations,
+            "files": {
+                name: {
+                    "path": str(entry.path),
+                    "loads": entry.loads,
+                    "errors": entry.errors,
+                    "last_load_ms": round(entry.last_load_ms, 2),
+                    "sha256": entry.digest[:12] if entry.digest else None,
+                }
+                for name, entry in self._entries.items()
+            },
+        }
+
+
+config_registry = ConfigRegistry(interval=float(os.getenv("CONFIG_RELOAD_INTERVAL", "10")))
@@ -0,0 +1,156 @@
+"""
+Compiled content bundle: all content YAML parsed ahead of time.
+
+- scripts/build_content_bundle.py (a Docker build step) parses every
+  content/**/*.yml once and writes CONTENT_BUNDLE_PATH: a versioned pickle
+  of the parsed documents keyed by the SHA-256 of the file
+- At runtime the YAML readers (content sync, slug lookup, config registry)
+  hash the bytes they read and take the document from the bundle when the
+  hash is in it, so only files changed since the build are parsed. A stale
+  bundle only causes misses; a missing, corrupt or other-version bundle is
+  ignored
+- The bundle is read on first use; each document is unpickled per lookup,
+  so every caller gets its own copy
+
+The bundle is a local build artifact and is trusted like the code (pickle).
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+from app.logging_config import content_logger
+
+CONTENT_BUNDLE_VERSION = 1
+CONTENT_BUNDLE_PATH = os.getenv("CONTENT_BUNDLE_PATH", "content/content.bundle")
+
+
+def compile_content_bundle(
+    content_root: str = "content", path: str = CONTENT_BUNDLE_PATH
+) -> Dict[str, Any]:
+    """
+    Parse every YAML file under content_root into a bundle at path.
+
+    Returns a summary (files, bytes, ms). Raises on a file that does not
+    parse, so a broken file fails the build instead of the startup.
+    """
+    started = time.perf_counter()
+    root = Path(content_root)
+    files: Dict[str, str] = {}
+    documents: Dict[str, bytes] = {}
+    paths = sorted(p for p in root.rglob("*") if p.suffix in (".yml", ".yaml") and p.is_file())
+    for file_path in paths:
+        raw = file_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        try:
+            document = yaml.safe_load(raw.decode("utf-8"))
+        except Exception as exc:
+            raise ValueError(f"Cannot compile {file_path}: {exc}") from exc
+        files[file_path.relative_to(root).as_posix()] = digest
+        documents[digest] = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+
+    bundle = {
+        "version": CONTENT_BUNDLE_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "files": files,
+        "documents": documents,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as out:
+        pickle.dump(bundle, out, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return {
+        "files": len(files),
+        "bytes": os.path.getsize(path),
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+class ContentBundle:
+    """
+    Parsed YAML documents by content hash, read lazily from a bundle file.
+
+    Args:
+        path: Bundle written by compile_content_bundle().
+    """
+
+    def __init__(self, path: str = CONTENT_BUNDLE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.load_ms = 0.0
+        self.built_at: Optional[str] = None
+        self._documents: Optional[Dict[str, bytes]] = None
+
+    def _load(self) -> Dict[str, bytes]:
+        started = time.perf_counter()
+        documents: Dict[str, bytes] = {}
+        try:
+            with open(self.path, "rb") as bundle_file:
+                bundle = pickle.load(bundle_file)
+            if bundle.get("version") != CONTENT_BUNDLE_VERSION:
+                content_logger.warning(
+                    f"Ignoring content bundle {self.path}: version {bundle.get('version')}"
+                )
+            else:
+                documents = bundle["documents"]
+                self.built_at = bundle.get("built_at")
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            content_logger.warning(f"Ignoring unreadable content bundle {self.path}: {exc}")
+        self.load_ms = (time.perf_counter() - started) * 1000
+        if documents:
+            content_logger.info(
+                f"Content bundle loaded: {len(documents)} documents in {self.load_ms:.1f} ms"
+            )
+        return documents
+
+    def get(self, digest: str) -> Any:
+        """Parsed document for a SHA-256 hex digest; raises KeyError when absent."""
+        if self._documents is None:
+            self._documents = self._load()
+        blob = self._documents.get(digest)
+        if blob is None:
+            self.misses += 1
+            raise KeyError(digest)
+        self.hits += 1
+        return pickle.loads(blob)
+
+    def clear(self) -> None:
+        """Forget the loaded bundle (it is read again on next use)."""
+        self._documents = None
+        self.built_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "loaded": bool(self._documents),
+            "built_at": self.built_at,
+            "documents": len(self._documents or ()),
+            "load_ms": round(self.load_ms, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+content_bundle = ContentBundle()
+
+
+def load_yaml(raw: bytes, digest: Optional[str] = None) -> Any:
+    """
+    Parsed YAML document of raw file bytes, from the content bundle when the
+    content is in it (digest: SHA-256 of raw, when already computed).
+    """
+    if digest is None:
+        digest = hashlib.sha256(raw).hexdigest()
+    try:
+        return content_bundle.get(digest)
+    except KeyError:
+        return yaml.safe_load(raw.decode("utf-8"))
@@ -3,19 +3,35 @@ YAML Content Loader for Gallery Twin.
 
 - Reads content/exhibits/*.yml files
 - Parses exhibit, images, questions
-- Inserts into DB.
+- Syncs them into the DB incrementally, driven by the content_manifest table:
+  a file whose mtime/size match its manifest row is skipped after one stat,
+  one whose SHA-256 matches is skipped without parsing. Changed files update
+  their exhibit, images are diffed (rows kept, updated, added or removed by
+  position) and all writes go into one transaction
+- Parsed documents come from the compiled content bundle when the file is
+  unchanged since the bundle was built (see content_bundle.py)
 """
 
 import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-import yaml
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, delete
 
-from app.models import Exhibit, Image, Question, QuestionType
+from app.models import ContentManifest, Exhibit, Image, Question, QuestionType
 from app.logging_config import content_logger, log_content_loading, log_error
+from app.services.content_bundle import load_yaml
+
+# Bump when the mapping from YAML to rows changes: every file is re-synced once
+CONTENT_PARSER_VERSION = 1
 
 
 def _order_from_filename(filename: str) -> int:
@@ -38,139 +54,342 @@ def _parse_question_type(value: str) -> QuestionType:
         raise ValueError(f"Unknown question type: {value}") from exc
 
 
-async def load_content_from_dir(
+def _question_options_json(q_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    options = q_data.get("options")
+    if options is None:
+        return None
+    # Pass layout as part of options_json if present
+    if isinstance(options, list):
+        return {"options": options, "layout": q_data.get("layout", "vertical")}
+    return options
+
+
+@dataclass
+class FileSyncResult:
+    """Outcome of syncing one YAML file."""
+
+    name: str
+    # unchanged (stat matched), touched (hash matched), created, updated,
+    # skipped (no slug) or error
+    status: str
+    slug: Optional[str] = None
+    ms: float = 0.0
+
+
+@dataclass
+class ContentSyncReport:
+    directory: str
+    files: List[FileSyncResult] = field(default_factory=list)
+    total_ms: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        """Files with an exhibit that is in sync (changed or not)."""
+        return sum(
+            1 for f in self.files if f.status in ("unchanged", "touched", "created", "updated")
+        )
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for f in self.files:
+            counts[f.status] = counts.get(f.status, 0) + 1
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "files": len(self.files),
+            "total_ms": round(self.total_ms, 2),
+            **self.counts(),
+        }
+
+
+last_sync_report: Optional[ContentSyncReport] = None
+
+
+def _scan(base: Path) -> List[Tuple[str, int, int]]:
+    """(name, mtime_ns, size) of the YAML files in base, sorted by name."""
+    with os.scandir(base) as it:
+        files = []
+        for entry in it:
+            if entry.name.endswith((".yml", ".yaml")) and entry.is_file():
+                stat = entry.stat()
+                files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return sorted(files)
+
+
+@dataclass
+class _ChangedFile:
+    result: FileSyncResult
+    path: str
+    stat: Tuple[int, int]
+    digest: str
+    data: Dict[str, Any]
+
+
+def _apply_exhibit_fields(exhibit: Exhibit, data: Dict[str, Any], order_index: int) -> None:
+    # English-only: use top-level data directly
+    exhibit.title = data.get("title", "")
+    exhibit.text_md = data.get("text_md", "")
+    exhibit.audio_path = data.get("audio")
+    exhibit.audio_transcript = data.get("audio_transcript")
+    exhibit.master_image = data.get("master_image")
+    exhibit.order_index = order_index
+
+
+async def _sync_images(
+    session: AsyncSession, exhibit_id: int, existing: List[Image], images: List[Dict[str, Any]]
+) -> None:
+    """Make the exhibit's image rows match the YAML list, keeping rows (and ids)
+    that did not change."""
+    for idx, img_data in enumerate(images):
+        path = img_data["path"]
+        alt_text = img_data.get("alt") or img_data.get("alt_text") or ""
+        if idx < len(existing):
+            image = existing[idx]
+            if (image.path, image.alt_text, image.sort_order) != (path, alt_text, idx):
+                image.path, image.alt_text, image.sort_order = path, alt_text, idx
+        else:
+            session.add(
+                Image(exhibit_id=exhibit_id, path=path, alt_text=alt_text, sort_order=idx)
+            )
+    for image in existing[len(images):]:
+        await session.delete(image)
+
+
+def _find_changes(
+    base: Path, manifest: Dict[str, Dict[str, Any]], exhibit_ids: Set[int]
+) -> Tuple[
+    List[Tuple[str, int, int]], List[FileSyncResult], List[_ChangedFile], List[Dict[str, Any]]
+]:
+    """
+    Compare the YAML files in base with their manifest rows (stat, then hash)
+    and parse only the changed ones.
+
+    Returns the scanned files, a result per file, the changed files and the
+    manifest rows of touched files (new stat, same content).
+    """
+    files = _scan(base)
+    results: List[FileSyncResult] = []
+    changed: List[_ChangedFile] = []
+    touched: List[Dict[str, Any]] = []
+    for name, mtime_ns, size in files:
+        started = time.perf_counter()
+        path = str(base / name)
+        row = manifest.get(path)
+        result = FileSyncResult(name=name, status="unchanged", slug=row["slug"] if row else None)
+        results.append(result)
+        in_sync = (
+            row is not None
+            and row["parser_version"] == CONTENT_PARSER_VERSION
+            and (row["slug"] is None or row["exhibit_id"] in exhibit_ids)
+        )
+        if in_sync and (row["mtime_ns"], row["size"]) == (mtime_ns, size):
+            result.ms = (time.perf_counter() - started) * 1000
+            continue
+
+        try:
+            raw = (base / name).read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            if in_sync and digest == row["sha256"]:
+                result.status = "touched"
+                touched.append({**row, "mtime_ns": mtime_ns, "size": size})
+                result.ms = (time.perf_counter() - started) * 1000
+                continue
+            data = load_yaml(raw, digest) or {}
+            if not isinstance(data, dict):
+                raise ValueError("top level must be a mapping")
+        except Exception as exc:
+            result.status = "error"
+            result.ms = (time.perf_counter() - started) * 1000
+            log_error("CONTENT_PARSE_ERROR", f"Error parsing YAML {base / name}: {exc}")
+            continue
+        result.slug = data.get("slug")
+        result.ms = (time.perf_counter() - started) * 1000
+        changed.append(_ChangedFile(result, path, (mtime_ns, size), digest, data))
+    return files, results, changed, touched
+
+
+async def sync_content_dir(
     session: AsyncSession, content_dir: str = "content/exhibits"
-) -> int:
+) -> ContentSyncReport:
     """
-    Load all exhibits from YAML files in a directory.
-    This function is now idempotent. It checks for existing slugs
-    and only inserts new ones.
-    Returns number of files processed.
+    Sync exhibits from the YAML files in content_dir into the DB and commit.
+
+    Exhibits are never deleted, and questions of existing exhibits are never
+    changed (they are STATIC: answers refer to them); a differing question
+    count in YAML is only reported.
     """
+    global last_sync_report
+    sync_started = time.perf_counter()
     base = Path(content_dir)
+    report = ContentSyncReport(directory=str(base))
     if not base.exists():
         content_logger.warning(f"Directory not found: {base}")
-        return 0
+        return report
 
-    files = sorted(list(base.glob("*.yml")) + list(base.glob("*.yaml")))
+    manifest = {
+        row.path: _manifest_values(row)
+        for row in (await session.execute(select(ContentManifest))).scalars().all()
+        if Path(row.path).parent == base
+    }
+    exhibit_ids = set((await session.execute(select(Exhibit.id))).scalars().all())
+
+    # Phase 1 runs in a worker thread (stat, hashing and YAML parsing)
+    files, report.files, changed, touched = await asyncio.to_thread(
+        _find_changes, base, manifest, exhibit_ids
+    )
     if not files:
         content_logger.info(f"No YAML files found in: {base}")
-        return 0
+        return report
 
-        # Fetch existing exhibits to sync them
-    result = await session.execute(select(Exhibit))
-    existing_exhibits = {exhibit.slug: exhibit for exhibit in result.scalars().all()}
+    # Phase 2: apply changed files (one query each for exhibits, images and
+    # question counts; one flush for new exhibits)
+    slugs = [c.data["slug"] for c in changed if c.data.get("slug")]
+    exhibits: Dict[str, Exhibit] = {}
+    images_by_exhibit: Dict[int, List[Image]] = {}
+    question_counts: Dict[int, int] = {}
+    if slugs:
+        result = await session.execute(select(Exhibit).where(Exhibit.slug.in_(slugs)))
+        exhibits = {exhibit.slug: exhibit for exhibit in result.scalars().all()}
+        ids = [exhibit.id for exhibit in exhibits.values()]
+        result = await session.execute(
+            select(Image).where(Image.exhibit_id.in_(ids)).order_by(Image.sort_order, Image.id)
+        )
+        for image in result.scalars().all():
+            images_by_exhibit.setdefault(image.exhibit_id, []).append(image)
+        result = await session.execute(
+            select(Question.exhibit_id, func.count(Question.id))
+            .where(Question.exhibit_id.in_(ids))
+            .group_by(Question.exhibit_id)
+        )
+        question_counts = dict(result.all())
 
-    content_logger.info(
-        f"Found {len(existing_exhibits)} existing exhibits. Syncing content from {len(files)} files..."
-    )
-    processed = 0
-    for f in files:
-        data = yaml.safe_load(f.read_text(encoding="utf-8")) or {}
-        slug = data.get("slug")
+    new_exhibits: List[Tuple[_ChangedFile, Exhibit]] = []
+    for c in changed:
+        started = time.perf_counter()
+        slug = c.data.get("slug")
         if not slug:
+            c.result.status = "skipped"
             continue
-
-        order_index = _order_from_filename(f.name)
-
-        # English-only: use top-level data directly
-        lang_data = data
-
-        is_new_exhibit = slug not in existing_exhibits
-
-        if not is_new_exhibit:
-            # Update existing exhibit (metadata only - keep questions intact)
-            exhibit = existing_exhibits[slug]
-            exhibit.title = lang_data.get("title", "")
-            exhibit.text_md = lang_data.get("text_md", "")
-            exhibit.audio_path = lang_data.get("audio")
-            exhibit.audio_transcript = lang_data.get("audio_transcript")
-            exhibit.master_image = data.get("master_image")
-            exhibit.order_index = order_index
-            session.add(exhibit)
-
-            # Only update images (safe to delete/recreate)
-            await session.execute(delete(Image).where(Image.exhibit_id == exhibit.id))
-
-            # Check if questions changed in YAML and warn
-            existing_questions_result = await session.execute(
-                select(Question).where(Question.exhibit_id == exhibit.id)
-            )
-            existing_questions_count = len(existing_questions_result.scalars().all())
-            yaml_questions_count = len(lang_data.get("questions", []))
-            if existing_questions_count != yaml_questions_count:
-                content_logger.warning(
-                    f"⚠️  QUESTION MISMATCH for '{slug}': "
-                    f"DB has {existing_questions_count} questions, YAML has {yaml_questions_count}. "
-                    f"Questions are STATIC - to update them, backup and reset the database!"
-                )
-
-            content_logger.debug(f"Updated existing exhibit: {slug} (questions preserved)")
-        else:
-            # Create new exhibit
-            exhibit = Exhibit(
-                slug=slug,
-                title=lang_data.get("title", ""),
-                text_md=lang_data.get("text_md", ""),
-                audio_path=lang_data.get("audio"),
-                audio_transcript=lang_data.get("audio_transcript"),
-                master_image=data.get("master_image"),
-                order_index=order_index,
-            )
+        order_index = _order_from_filename(c.result.name)
+        exhibit = exhibits.get(slug)
+        if exhibit is None:
+            exhibit = Exhibit(slug=slug)
+            _apply_exhibit_fields(exhibit, c.data, order_index)
             session.add(exhibit)
+            exhibits[slug] = exhibit
+            new_exhibits.append((c, exhibit))
+            c.result.status = "created"
+            c.result.ms += (time.perf_counter() - started) * 1000
             content_logger.debug(f"Created new exhibit: {slug}")
+            continue
 
-        await session.flush()  # Flush to get exhibit.id
-
-        # Add images from YAML (always recreate)
-        for idx, img_data in enumerate(data.get("images", [])):
-            image = Image(
-                exhibit_id=exhibit.id,
-                path=img_data["path"],
-                alt_text=img_data.get("alt") or img_data.get("alt_text") or "",
-                sort_order=idx,
+        # Update existing exhibit (metadata and images - keep questions intact)
+        _apply_exhibit_fields(exhibit, c.data, order_index)
+        await _sync_images(
+            session, exhibit.id, images_by_exhibit.pop(exhibit.id, []), c.data.get("images") or []
+        )
+        yaml_questions_count = len(c.data.get("questions") or [])
+        existing_questions_count = question_counts.get(exhibit.id, 0)
+        if existing_questions_count != yaml_questions_count:
+            content_logger.warning(
+                f"⚠️  QUESTION MISMATCH for '{slug}': "
+                f"DB has {existing_questions_count} questions, YAML has {yaml_questions_count}. "
+                f"Questions are STATIC - to update them, backup and reset the database!"
             )
-            session.add(image)
-
-        # Add questions from YAML - ONLY for NEW exhibits
-        if is_new_exhibit:
-            for idx, q_data in enumerate(lang_data.get("questions", [])):
-                q_type = _parse_question_type(q_data["type"])
-                options = q_data.get("options")
-                # Pass layout as part of options_json if present
-                if options is not None:
-                    if isinstance(options, list):
-                        options_json = {
-                            "options": options,
-                            "layout": q_data.get("layout", "vertical"),
-                        }
-                    else:
-                        options_json = options
-                else:
-                    options_json = None
-                question = Question(
-                    exhibit_id=exhibit.id,
-                    text=q_data["text"],
-                    type=q_type,
-                    options_json=options_json,
-                    required=bool(q_data.get("required", False)),
-                    sort_order=idx,
+        c.result.status = "updated"
+        c.result.ms += (time.perf_counter() - started) * 1000
+        content_logger.debug(f"Updated existing exhibit: {slug} (questions preserved)")
+
+    if new_exhibits:
+        await session.flush()  # Flush to get the new exhibits' ids
+        for c, exhibit in new_exhibits:
+            await _sync_images(session, exhibit.id, [], c.data.get("images") or [])
+            # Add questions from YAML - ONLY for NEW exhibits
+            for idx, q_data in enumerate(c.data.get("questions") or []):
+                session.add(
+                    Question(
+                        exhibit_id=exhibit.id,
+                        text=q_data["text"],
+                        type=_parse_question_type(q_data["type"]),
+                        options_json=_question_options_json(q_data),
+                        required=bool(q_data.get("required", False)),
+                        sort_order=idx,
+                    )
                 )
-                session.add(question)
+    await session.flush()
 
-        processed += 1
+    # Phase 3: manifest rows for synced and touched files, drop removed files
+    now = datetime.now(timezone.utc)
+    manifest_rows = touched + [
+        {
+            "path": c.path,
+            "slug": c.result.slug if c.result.status != "skipped" else None,
+            "exhibit_id": exhibits[c.result.slug].id if c.result.status != "skipped" else None,
+            "mtime_ns": c.stat[0],
+            "size": c.stat[1],
+            "sha256": c.digest,
+            "parser_version": CONTENT_PARSER_VERSION,
+        }
+        for c in changed
+    ]
+    if manifest_rows:
+        table = ContentManifest.__table__
+        stmt = sqlite_insert(table).values([{**row, "synced_at": now} for row in manifest_rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["path"],
+            set_={
+                name: stmt.excluded[name]
+                for name in ("slug", "exhibit_id", "mtime_ns", "size", "sha256",
+                             "parser_version", "synced_at")
+            },
+        )
+        await session.execute(stmt)
+    present = {str(base / name) for name, _, _ in files}
+    stale = [path for path in manifest if path not in present]
+    if stale:
+        await session.execute(delete(ContentManifest).where(ContentManifest.path.in_(stale)))
 
     await session.commit()
+    report.total_ms = (time.perf_counter() - sync_started) * 1000
+    last_sync_report = report
 
-    if processed > 0:
-        log_content_loading(processed, directory=str(base))
+    for f in report.files:
+        content_logger.debug(f"Content sync {f.name}: {f.status} in {f.ms:.1f} ms")
+    if report.processed > 0:
+        log_content_loading(report.processed, directory=str(base), **report.counts())
         content_logger.info(
-            f"Successfully synchronized {processed} exhibits from {base}"
+            f"Synchronized {report.processed} exhibits from {base} "
+            f"in {report.total_ms:.1f} ms ({report.counts()})"
         )
     else:
         content_logger.info("No YAML files to process")
+    return report
+
+
+def _manifest_values(row: ContentManifest) -> Dict[str, Any]:
+    return {
+        "path": row.path,
+        "slug": row.slug,
+        "exhibit_id": row.exhibit_id,
+        "mtime_ns": row.mtime_ns,
+        "size": row.size,
+        "sha256": row.sha256,
+        "parser_version": row.parser_version,
+    }
 
-    return processed
+
+async def load_content_from_dir(
+    session: AsyncSession, content_dir: str = "content/exhibits"
+) -> int:
+    """
+    Load all exhibits from YAML files in a directory (see sync_content_dir).
+    Idempotent: unchanged files are skipped, existing exhibits are updated.
+    Returns number of exhibit files in sync.
+    """
+    report = await sync_content_dir(session, content_dir)
+    return report.processed
 
 
 # Add utility to get slugs from YAML files
@@ -187,7 +406,7 @@ def get_yaml_slugs(content_dir: str = "content/exhibits") -> list[str]:
     files = sorted(base.glob("*.yml")) + sorted(base.glob("*.yaml"))
     for f in files:
         try:
-            data = yaml.safe_load(f.read_text(encoding="utf-8")) or {}
+            data = load_yaml(f.read_bytes()) or {}
             slug = data.get("slug")
             if slug:
                 slugs.append(slug)
@@ -196,3 +415,85 @@ def get_yaml_slugs(content_dir: str = "content/exhibits") -> list[str]:
             content_logger.error(f"Error parsing YAML {f}: {exc}")
             continue
     return slugs
+
+
+def content_dir_signature(content_dir: str = "content/exhibits") -> tuple:
+    """
+    Cheap signature of a content directory: its mtime plus each YAML file's
+    name, mtime and size (empty when the directory is missing).
+    """
+    base = Path(content_dir)
+    try:
+        files = []
+        with os.scandir(base) as it:
+            for entry in it:
+                if entry.name.endswith((".yml", ".yaml")):
+                    stat = entry.stat()
+                    files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return (base.stat().st_mtime_ns, tuple(sorted(files)))
+    except FileNotFoundError:
+        return ()
+
+
+class ExhibitSlugCache:
+    """
+    Cache of get_yaml_slugs() results per content directory.
+
+    The cache key is content_dir_signature(), so adding, removing or editing
+    an exhibit file invalidates it without re-parsing YAML on every call.
+
+    Args:
+        max_age: Seconds an entry is served without scanning the directory
+            again (0 = scan on every call). Every new visitor session asks
+            for the slugs on the event loop, so the app bounds the scans to
+            one per CONTENT_RELOAD_INTERVAL; content_reloader clears the
+            cache after a reload.
+        clock: Time source (monotonic seconds).
+    """
+
+    def __init__(self, max_age: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self.clock = clock
+        # content_dir -> (signature, checked at, slugs)
+        self._entries: Dict[str, Tuple[tuple, float, Tuple[str, ...]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+
+    def get(self, content_dir: str = "content/exhibits") -> Tuple[str, ...]:
+        """Return slugs for content_dir, re-reading YAML only if files changed."""
+        now = self.clock()
+        cached = self._entries.get(content_dir)
+        if cached is not None and now - cached[1] < self.max_age:
+            self.hits += 1
+            return cached[2]
+
+        self.scans += 1
+        signature = content_dir_signature(content_dir)
+        if cached is not None and cached[0] == signature:
+            self.hits += 1
+            self._entries[content_dir] = (signature, now, cached[2])
+            return cached[2]
+
+        self.misses += 1
+        slugs = tuple(get_yaml_slugs(content_dir))
+        self._entries[content_dir] = (signature, now, slugs)
+        return slugs
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "scans": self.scans}
+
+
+# CONTENT_RELOAD_INTERVAL=0 (reload only on demand): scan once, until a reload
+_reload_interval = float(os.getenv("CONTENT_RELOAD_INTERVAL", "10"))
+slug_cache = ExhibitSlugCache(
+    max_age=_reload_interval if _reload_interval > 0 else float("inf")
+)
+
+
+def get_cached_yaml_slugs(content_dir: str = "content/exhibits") -> list[str]:
+    """Cached variant of get_yaml_slugs(); returns a fresh list on every call."""
+    return list(slug_cache.get(content_dir))
@@ -0,0 +1,193 @@
+"""
+In-memory registry of exhibit content for Gallery Twin.
+
+- Built at startup, right after YAML content is synced into the DB, and
+  rebuilt on content reload (see content_reload.py)
+- A build never modifies the active registry: the new one is published with
+  a single reference swap, so a request sees either the old or the new
+  content, never a mix
+- Holds frozen, slotted records indexed by exhibit slug and question id
+- Lets public exhibit pages render without querying exhibits/images/questions
+- Exhibit markdown is rendered here once (text_html); a rebuild re-renders
+  only texts whose content hash changed
+"""
+
+import asyncio
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.logging_config import content_logger
+from app.models import Exhibit, QuestionType
+from app.services.markdown_cache import markdown_renderer
+
+
+@dataclass(frozen=True, slots=True)
+class ImageRecord:
+    """Immutable copy of an Image row."""
+
+    id: int
+    exhibit_id: int
+    path: str
+    alt_text: str
+    sort_order: int
+
+
+@dataclass(frozen=True, slots=True)
+class QuestionRecord:
+    """Immutable copy of a Question row."""
+
+    id: int
+    exhibit_id: Optional[int]
+    text: str
+    type: QuestionType
+    options_json: Optional[Dict[str, Any]]
+    required: bool
+    sort_order: int
+
+
+@dataclass(frozen=True, slots=True)
+class ExhibitRecord:
+    """Immutable copy of an Exhibit row with its images and questions."""
+
+    id: int
+    slug: str
+    title: str
+    text_md: str
+    # Rendered text_md and the content hash it was rendered from
+    text_html: str
+    text_hash: str
+    audio_path: Optional[str]
+    audio_transcript: Optional[str]
+    master_image: Optional[str]
+    order_index: int
+    images: Tuple[ImageRecord, ...]
+    questions: Tuple[QuestionRecord, ...]
+    # Pre-serialized images for Alpine.js (same shape as ImageResponse.model_dump())
+    images_json: Tuple[Dict[str, Any], ...]
+
+
+class ContentRegistry:
+    """Read-only lookup of exhibits by slug and questions by id."""
+
+    __slots__ = ("_exhibits", "_questions", "_slugs")
+
+    def __init__(self, exhibits: Tuple[ExhibitRecord, ...] = ()):
+        self._slugs: Tuple[str, ...] = tuple(exhibit.slug for exhibit in exhibits)
+        self._exhibits: Mapping[str, ExhibitRecord] = MappingProxyType(
+            {exhibit.slug: exhibit for exhibit in exhibits}
+        )
+        self._questions: Mapping[int, QuestionRecord] = MappingProxyType(
+            {q.id: q for exhibit in exhibits for q in exhibit.questions}
+        )
+
+    def get_exhibit(self, slug: str) -> Optional[ExhibitRecord]:
+        """Return exhibit record for slug, or None if unknown."""
+        return self._exhibits.get(slug)
+
+    def get_question(self, question_id: int) -> Optional[QuestionRecord]:
+        """Return question record for id, or None if unknown."""
+        return self._questions.get(question_id)
+
+    @property
+    def exhibits(self) -> Mapping[str, ExhibitRecord]:
+        return self._exhibits
+
+    @property
+    def slugs(self) -> Tuple[str, ...]:
+        """Exhibit slugs in canonical (order_index) order."""
+        return self._slugs
+
+    def __len__(self) -> int:
+        return len(self._exhibits)
+
+
+def _exhibit_to_record(
+    exhibit: Exhibit, rendered: Mapping[str, str] = MappingProxyType({})
+) -> ExhibitRecord:
+    images = tuple(
+        ImageRecord(
+            id=img.id,
+            exhibit_id=img.exhibit_id,
+            path=img.path,
+            alt_text=img.alt_text,
+            sort_order=img.sort_order,
+        )
+        for img in sorted(exhibit.images, key=lambda i: (i.sort_order, i.id))
+    )
+    questions = tuple(
+        QuestionRecord(
+            id=q.id,
+            exhibit_id=q.exhibit_id,
+            text=q.text,
+            type=QuestionType(q.type),
+            options_json=q.options_json,
+            required=q.required,
+            sort_order=q.sort_order,
+        )
+        for q in sorted(exhibit.questions, key=lambda q: (q.sort_order, q.id))
+    )
+    images_json = tuple(
+        {
+            "path": img.path,
+            "alt_text": img.alt_text,
+            "sort_order": img.sort_order,
+            "id": img.id,
+            "exhibit_id": img.exhibit_id,
+        }
+        for img in images
+    )
+    text_hash, text_html = markdown_renderer.prerender(exhibit.text_md, rendered)
+    return ExhibitRecord(
+        id=exhibit.id,
+        slug=exhibit.slug,
+        title=exhibit.title,
+        text_md=exhibit.text_md,
+        text_html=text_html,
+        text_hash=text_hash,
+        audio_path=exhibit.audio_path,
+        audio_transcript=exhibit.audio_transcript,
+        master_image=exhibit.master_image,
+        order_index=exhibit.order_index,
+        images=images,
+        questions=questions,
+        images_json=images_json,
+    )
+
+
+def _build_registry(exhibits: List[Exhibit], rendered: Mapping[str, str]) -> ContentRegistry:
+    return ContentRegistry(tuple(_exhibit_to_record(exhibit, rendered) for exhibit in exhibits))
+
+
+_registry = ContentRegistry()
+
+
+async def build_content_registry(session: AsyncSession) -> ContentRegistry:
+    """
+    Snapshot all exhibits (with images and questions) from the DB into a new
+    registry and make it the active one. Call after load_content_from_dir.
+    On error the active registry is left untouched.
+    """
+    global _registry
+
+    result = await session.execute(
+        select(Exhibit)
+        .options(selectinload(Exhibit.images), selectinload(Exhibit.questions))
+        .order_by(Exhibit.order_index)
+    )
+    # Markdown already rendered by the current registry, by content hash
+    rendered = {r.text_hash: r.text_html for r in _registry.exhibits.values()}
+    # Records and markdown are built in a worker thread (rows are fully loaded)
+    registry = await asyncio.to_thread(_build_registry, result.scalars().all(), rendered)
+    _registry = registry
+    content_logger.info(f"Content registry built with {len(registry)} exhibits")
+    return registry
+
+
+def get_content_registry() -> ContentRegistry:
+    """Return the active content registry."""
+    return _registry
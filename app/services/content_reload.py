@@ -0,0 +1,150 @@
+"""
+Hot reload of exhibit content, without restarting the app.
+
+- A background task checks content_dir_signature() (one directory scan) every
+  CONTENT_RELOAD_INTERVAL seconds; POST /admin/content/reload forces a reload
+- A reload syncs changed YAML files into the DB (incremental, see
+  sync_content_dir) and builds a new content registry; file reading, YAML
+  parsing and record building run in worker threads, off the event loop
+- The new registry replaces the active one with a single reference swap, so
+  requests see either the old or the new content. When the sync or build
+  fails, the old registry stays active and the reload is retried on the next
+  tick
+- Reloads are serialized: a tick during a forced reload waits for it and then
+  finds nothing to do
+- A reload clears the exhibit slug cache (content_loader.slug_cache), which
+  otherwise rescans the directory at most once per CONTENT_RELOAD_INTERVAL
+
+selfeval.yml, site_copy.yml and exhibition_feedback.yml are reloaded by
+config_registry.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.db import engine
+from app.logging_config import logger
+from app.services.content_loader import (
+    ContentSyncReport,
+    content_dir_signature,
+    slug_cache,
+    sync_content_dir,
+)
+from app.services.content_registry import (
+    ContentRegistry,
+    build_content_registry,
+    get_content_registry,
+)
+
+
+class ContentReloader:
+    """
+    Watches an exhibit directory and republishes the content registry.
+
+    Args:
+        content_dir: Directory with the exhibit YAML files.
+        interval: Seconds between checks (0 = no background checks; reload()
+            still works).
+    """
+
+    def __init__(self, content_dir: str = "content/exhibits", interval: float = 10.0):
+        self.content_dir = content_dir
+        self.interval = interval
+        self.checks = 0
+        self.reloads = 0
+        self.errors = 0
+        self.last_reload_ms = 0.0
+        self.last_report: Optional[ContentSyncReport] = None
+        self._signature: Optional[tuple] = None
+        self._listeners: List[Callable[[ContentRegistry], None]] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_listener(self, listener: Callable[[ContentRegistry], None]) -> None:
+        """Call listener with the active registry now and after every reload."""
+        self._listeners.append(listener)
+        listener(get_content_registry())
+
+    async def reload(
+        self, force: bool = False, bind: Optional[AsyncEngine] = None
+    ) -> Optional[ContentSyncReport]:
+        """
+        Sync the directory and publish a new registry if any file changed
+        (always when force). Returns the sync report, or None when nothing
+        changed.
+        """
+        async with self._lock:
+            self.checks += 1
+            signature = await asyncio.to_thread(content_dir_signature, self.content_dir)
+            if not force and signature == self._signature:
+                return None
+
+            started = time.perf_counter()
+            try:
+                async with AsyncSession(bind or engine, expire_on_commit=False) as session:
+                    report = await sync_content_dir(session, self.content_dir)
+                    registry = await build_content_registry(session)
+            except Exception as exc:
+                self.errors += 1
+                logger.error(f"Content reload failed, keeping current content: {exc}")
+                raise
+
+            # Changes made during the sync are picked up on the next check
+            self._signature = signature
+            self.reloads += 1
+            self.last_report = report
+            self.last_reload_ms = (time.perf_counter() - started) * 1000
+            slug_cache.clear()
+            for listener in self._listeners:
+                listener(registry)
+            logger.info(
+                f"Content reloaded in {self.last_reload_ms:.1f} ms "
+                f"({len(registry)} exhibits, {report.counts()})"
+            )
+            return report
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload()
+            except Exception:
+                # Already logged; retry on next tick
+                pass
+
+    def start(self) -> None:
+        """
+        Start background checks (app lifespan, after the startup content
+        load); the current directory state counts as loaded.
+        """
+        self._signature = content_dir_signature(self.content_dir)
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_reload_ms": round(self.last_reload_ms, 2),
+            "exhibits": len(get_content_registry()),
+        }
+
+
+content_reloader = ContentReloader(
+    "content/exhibits", interval=float(os.getenv("CONTENT_RELOAD_INTERVAL", "10"))
+)
@@ -0,0 +1,118 @@
+"""
+Cache for the admin dashboard statistics.
+
+- Visitor routes bump a write generation after committing selfeval, answers
+  or feedback (the writes the dashboard summarizes)
+- A cached result is served while no such write happened since it was
+  computed, or while it is younger than the TTL (bounded staleness, so a busy
+  gallery does not force a recomputation on every page load)
+- Concurrent misses are coalesced: one request computes, the others await
+  the same result (single flight)
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class DashboardCache:
+    """
+    Single-entry cache with write-generation invalidation and single flight.
+
+    Args:
+        ttl: Seconds a result may be served although writes happened since it
+            was computed (0 = recompute after every write).
+        clock: Monotonic time source (overridable in tests).
+    """
+
+    def __init__(self, ttl: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.computations = 0
+        self.compute_seconds = 0.0
+        self.last_compute_seconds = 0.0
+        # (generation at compute start, computed at, value)
+        self._entry: Optional[Tuple[int, float, Any]] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    def bump_generation(self) -> None:
+        """Record a committed write that changes dashboard statistics."""
+        self.generation += 1
+
+    def clear(self) -> None:
+        self._entry = None
+
+    def _fresh(self) -> bool:
+        if self._entry is None:
+            return False
+        generation, computed_at, _ = self._entry
+        return generation == self.generation or self.clock() - computed_at < self.ttl
+
+    async def get(self, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result, or compute it (once for concurrent callers)."""
+        while True:
+            if self._fresh():
+                self.hits += 1
+                return self._entry[2]
+
+            inflight = self._inflight
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The computing request was cancelled, not this one: retry
+                if not inflight.cancelled():
+                    raise
+
+        self.misses += 1
+        generation = self.generation
+        started = self.clock()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when no one else is waiting
+            raise
+        finally:
+            self._inflight = None
+
+        elapsed = self.clock() - started
+        self.computations += 1
+        self.compute_seconds += elapsed
+        self.last_compute_seconds = elapsed
+        # Writes that landed during the computation may be missing from it, so
+        # the entry is tagged with the generation seen when it started
+        self._entry = (generation, started, value)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl": self.ttl,
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "computations": self.computations,
+            "last_compute_ms": round(self.last_compute_seconds * 1000, 2),
+            "avg_compute_ms": (
+                round(self.compute_seconds / self.computations * 1000, 2)
+                if self.computations
+                else 0.0
+            ),
+        }
+
+
+dashboard_cache = DashboardCache(ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "5")))
@@ -0,0 +1,197 @@
+"""
+In-memory ring buffer for visitor interaction events (beacons).
+
+- POST /events appends validated events here and answers 204 right away;
+  nothing touches the database on the request path
+- Events are keyed by session UUID (from the cookie); UUIDs and exhibit ids
+  are resolved in one query each at flush time, and events of sessions that
+  were never persisted are dropped
+- A background task flushes them as one bulk INSERT every N seconds, when the
+  buffer reaches a size threshold, and at shutdown
+- The buffer is bounded: when the database cannot keep up, the oldest events
+  are overwritten (counted in stats()["dropped"]) instead of growing memory
+"""
+
+import asyncio
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import engine
+from app.logging_config import logger
+from app.models import Event, EventType, Exhibit, Session
+
+
+class BufferedEvent(NamedTuple):
+    session_uuid: UUID
+    exhibit_id: Optional[int]
+    event_type: EventType
+    timestamp: datetime
+    metadata_json: Optional[Dict[str, Any]]
+
+
+class EventBuffer:
+    """
+    Bounded event buffer persisted in bulk.
+
+    Args:
+        capacity: Events kept in memory; older ones are overwritten beyond it.
+        flush_interval: Seconds between background flushes.
+        flush_size: Buffered events that trigger an early flush.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        flush_interval: float = 5.0,
+        flush_size: int = 500,
+    ):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.received = 0
+        self.written = 0
+        self.dropped = 0
+        self.unknown_session = 0
+        self.flushes = 0
+        self._events: Deque[BufferedEvent] = deque(maxlen=capacity)
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, events: Iterable[BufferedEvent]) -> None:
+        """Buffer events; never blocks and never touches the database."""
+        for event in events:
+            if len(self._events) == self.capacity:
+                self.dropped += 1
+            self._events.append(event)
+            self.received += 1
+        if len(self._events) >= self.flush_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self, bind: Optional[AsyncEngine] = None) -> int:
+        """Persist all buffered events in a single executemany INSERT."""
+        if not self._events:
+            return 0
+
+        bind = bind or engine
+        pending = list(self._events)
+        self._events.clear()
+        sessions = Session.__table__
+        exhibits = Exhibit.__table__
+        try:
+            async with bind.begin() as conn:
+                session_ids = dict(
+                    (
+                        await conn.execute(
+                            select(sessions.c.uuid, sessions.c.id).where(
+                                sessions.c.uuid.in_({e.session_uuid for e in pending})
+                            )
+                        )
+                    ).all()
+                )
+                exhibit_ids = {e.exhibit_id for e in pending if e.exhibit_id is not None}
+                if exhibit_ids:
+                    exhibit_ids = set(
+                        (
+                            await conn.execute(
+                                select(exhibits.c.id).where(exhibits.c.id.in_(exhibit_ids))
+                            )
+                        ).scalars()
+                    )
+                rows = [
+                    {
+                        "session_id": session_ids[event.session_uuid],
+                        "exhibit_id": event.exhibit_id if event.exhibit_id in exhibit_ids else None,
+                        "event_type": event.event_type,
+                        "timestamp": event.timestamp,
+                        "created_at": event.timestamp,
+                        "metadata_json": event.metadata_json,
+                    }
+                    for event in pending
+                    if event.session_uuid in session_ids
+                ]
+                if rows:
+                    await conn.execute(insert(Event.__table__), rows)
+        except Exception as exc:
+            # Put events back in front of newer ones (capacity still applies)
+            restored = deque(pending, maxlen=self.capacity)
+            overflow = len(pending) + len(self._events) - self.capacity
+            restored.extend(self._events)
+            self.dropped += max(overflow, 0)
+            self._events = restored
+            logger.error(f"Event buffer flush failed: {exc}")
+            raise
+
+        self.flushes += 1
+        self.written += len(rows)
+        self.unknown_session += len(pending) - len(rows)
+        logger.debug(f"Flushed {len(rows)} events")
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Already logged; retry on next tick
+                pass
+
+    def start(self) -> None:
+        """Start the background flush task (call from app lifespan)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._events),
+            "capacity": self.capacity,
+            "received": self.received,
+            "written": self.written,
+            "dropped": self.dropped,
+            "unknown_session": self.unknown_session,
+            "flushes": self.flushes,
+        }
+
+
+def buffered_events(
+    session_uuid: UUID, events: List[Any], now: Optional[datetime] = None
+) -> List[BufferedEvent]:
+    """Stamp validated EventCreate payloads with the session and receive time."""
+    now = now or datetime.now(timezone.utc)
+    return [
+        BufferedEvent(session_uuid, e.exhibit_id, e.event_type, now, e.metadata_json)
+        for e in events
+    ]
+
+
+event_buffer = EventBuffer(
+    capacity=int(os.getenv("EVENT_BUFFER_CAPACITY", "10000")),
+    flush_interval=float(os.getenv("EVENT_FLUSH_INTERVAL", "5")),
+    flush_size=int(os.getenv("EVENT_FLUSH_SIZE", "500")),
+)
@@ -7,7 +7,10 @@ Each visitor gets exhibits in a unique random order, stored in their session.
 import random
 from typing import List
 
-from app.services.content_loader import get_yaml_slugs
+from app.services.content_loader import get_cached_yaml_slugs
+
+# Session.progress_mask is a signed 64-bit SQLite integer
+MAX_PROGRESS_BITS = 63
 
 
 def generate_random_exhibit_order() -> List[str]:
@@ -17,8 +20,8 @@ def generate_random_exhibit_order() -> List[str]:
     Returns:
         List of exhibit slugs in random order, e.g. ["zongler", "bludicka", "dva", ...]
     """
-    # Get all exhibit slugs from YAML files
-    slugs = get_yaml_slugs("content/exhibits")
+    # Get all exhibit slugs (cached; YAML is re-read only when files change)
+    slugs = get_cached_yaml_slugs("content/exhibits")
 
     # Shuffle the list in place
     random.shuffle(slugs)
@@ -98,3 +101,38 @@ def get_previous_exhibit_slug(exhibit_order: List[str], current_slug: str) -> st
         return None
 
     return get_exhibit_slug_by_index(exhibit_order, current_index - 1)
+
+
+def get_progress_bit(exhibit_order: List[str], slug: str) -> int:
+    """
+    Get the bit representing an exhibit in Session.progress_mask.
+
+    Args:
+        exhibit_order: List of slugs in randomized order
+        slug: Exhibit slug
+
+    Returns:
+        1 << index of the slug, or 0 if the slug is not in the order (or past
+        MAX_PROGRESS_BITS) and progress cannot be tracked for it
+    """
+    index = get_exhibit_index_by_slug(exhibit_order, slug)
+    if index is None or index >= MAX_PROGRESS_BITS:
+        return 0
+    return 1 << index
+
+
+def get_first_unanswered_slug(exhibit_order: List[str], progress_mask: int) -> str | None:
+    """
+    Get the first exhibit in the order that has not been answered yet.
+
+    Args:
+        exhibit_order: List of slugs in randomized order
+        progress_mask: Session.progress_mask
+
+    Returns:
+        First unanswered exhibit slug, or None if all are answered
+    """
+    for index, slug in enumerate(exhibit_order):
+        if not progress_mask >> index & 1:
+            return slug
+    return None
@@ -1,40 +1,73 @@
 """
 Exhibition feedback configuration loader.
+
+content/exhibition_feedback.yml is parsed by the config registry
+(app/services/config_registry.py) into immutable, pre-sorted structures.
 """
 
-import yaml
-from pathlib import Path
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from app.services.config_registry import config_registry, freeze
+
+EXHIBITION_FEEDBACK_PATH = "content/exhibition_feedback.yml"
+
+
+@dataclass(frozen=True)
+class FeedbackConfigData:
+    """Questions sorted by sort_order and categories in declaration order."""
+
+    questions: Tuple[Any, ...]
+    categories: Tuple[Any, ...]
+
+
+def _fallback_document() -> Dict[str, Any]:
+    # Fallback questions if file doesn't exist
+    return {
+        "questions": [
+            {
+                "id": "exhibition_rating",
+                "type": "likert",
+                "text": "Jak se vám výstava líbila?",
+                "options": {"min": 1, "max": 5},
+                "required": True,
+            },
+            {
+                "id": "ai_art_opinion",
+                "type": "text",
+                "text": "Co si myslíte o AI v umění?",
+                "required": False,
+            },
+        ]
+    }
+
+
+def build_feedback_config(document: Dict[str, Any]) -> FeedbackConfigData:
+    questions = freeze(document.get("questions") or [])
+    return FeedbackConfigData(
+        # sorted() is stable: questions without sort_order keep file order
+        questions=tuple(sorted(questions, key=lambda q: q.get("sort_order", 999))),
+        categories=freeze(document.get("categories") or []),
+    )
+
+
+config_registry.register(
+    "exhibition_feedback",
+    EXHIBITION_FEEDBACK_PATH,
+    build=build_feedback_config,
+    fallback=_fallback_document,
+)
 
 
 class ExhibitionFeedbackConfig:
     """Configuration loader for exhibition feedback questions."""
 
     @staticmethod
-    def get_questions() -> List[Dict[str, Any]]:
-        """Load exhibition feedback questions from YAML file."""
-        config_path = Path("content/exhibition_feedback.yml")
-
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-                return config.get("questions", [])
-        except FileNotFoundError:
-            # Fallback questions if file doesn't exist
-            return [
-                {
-                    "id": "exhibition_rating",
-                    "type": "likert",
-                    "text": "Jak se vám výstava líbila?",
-                    "options": {"min": 1, "max": 5},
-                    "required": True,
-                },
-                {
-                    "id": "ai_art_opinion",
-                    "type": "text",
-                    "text": "Co si myslíte o AI v umění?",
-                    "required": False,
-                },
-            ]
-        except Exception:
-            return []
+    def get_questions() -> Tuple[Any, ...]:
+        """Exhibition feedback questions, sorted by sort_order (read-only)."""
+        return config_registry.get("exhibition_feedback").questions
+
+    @staticmethod
+    def get_categories() -> Tuple[Any, ...]:
+        """Question categories (id + label) used to group feedback in analytics."""
+        return config_registry.get("exhibition_feedback").categories
@@ -0,0 +1,123 @@
+"""
+Streaming CSV export of all exhibit answers for the admin.
+
+- Rows are read through a server-side cursor (AsyncSession.stream) and
+  written out in fixed-size chunks, so memory stays constant for any number
+  of answers
+- The header is sent before the query runs, so the download starts at once
+- Rows come in Answer.id order (rowid scan, no sort to wait for)
+"""
+
+import csv
+import io
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models import Answer, Exhibit, Question, Session
+from app.services.analytics import SELFEVAL_FIELDS
+
+EXPORT_CHUNK_SIZE = 1000
+
+CSV_COLUMNS = [
+    "session_uuid",
+    "ts",
+    "exhibit_slug",
+    "question_id",
+    "question_text",
+    "answer_value",
+    *(f"selfeval_{field}" for field in SELFEVAL_FIELDS),
+]
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def decode_answer(value_json: Any, value_text: Optional[str]) -> str:
+    """Answer value as a CSV cell; multi-choice options are joined by '; '."""
+    value = value_json if value_json is not None else value_text
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(str(v) for v in value)
+    return str(value)
+
+
+def _csv_chunk(rows: List[List[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def export_answers_stmt(since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Answers joined with their session, question and exhibit."""
+    answers = Answer.__table__
+    sessions = Session.__table__
+    questions = Question.__table__
+    exhibits = Exhibit.__table__
+    stmt = (
+        select(
+            sessions.c.uuid,
+            answers.c.created_at,
+            exhibits.c.slug,
+            answers.c.question_id,
+            questions.c.text,
+            answers.c.value_json,
+            answers.c.value_text,
+            sessions.c.selfeval_json,
+        )
+        .select_from(answers)
+        .join(sessions, answers.c.session_id == sessions.c.id)
+        .join(questions, answers.c.question_id == questions.c.id)
+        .outerjoin(exhibits, questions.c.exhibit_id == exhibits.c.id)
+        .order_by(answers.c.id)
+    )
+    since = _as_naive_utc(since)
+    until = _as_naive_utc(until)
+    if since is not None:
+        stmt = stmt.where(answers.c.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(answers.c.created_at < until)
+    return stmt
+
+
+async def iter_answers_csv(
+    bind: AsyncEngine,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """
+    Yield the answers export as CSV text chunks of up to chunk_size rows.
+
+    Opens its own session on bind: the StreamingResponse body is consumed
+    after the request's dependencies (and their session) have exited.
+    """
+    yield _csv_chunk([CSV_COLUMNS])
+
+    async with AsyncSession(bind) as db_session:
+        result = await db_session.stream(
+            export_answers_stmt(since, until).execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions(chunk_size):
+            rows = []
+            for uuid, created_at, slug, question_id, text, value_json, value_text, selfeval in partition:
+                selfeval = selfeval if isinstance(selfeval, dict) else {}
+                rows.append(
+                    [
+                        str(uuid),
+                        created_at.isoformat() if created_at else "",
+                        slug or "",
+                        question_id,
+                        text,
+                        decode_answer(value_json, value_text),
+                        *(selfeval.get(field, "") for field in SELFEVAL_FIELDS),
+                    ]
+                )
+            yield _csv_chunk(rows)
@@ -0,0 +1,94 @@
+"""
+Markdown rendering with caches.
+
+- Exhibit text is rendered once when the content registry is built and
+  stored on the record (ExhibitRecord.text_html), keyed by a hash of the
+  markdown so a rebuild only renders texts that changed
+- The `markdown` Jinja filter renders other strings (e.g. from site_copy.yml)
+  through a bounded LRU cache
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from markdown_it import MarkdownIt
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class MarkdownRenderer:
+    """
+    MarkdownIt renderer with an LRU cache for ad-hoc strings.
+
+    Args:
+        max_entries: Rendered strings kept by render() (0 = no caching).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.prerendered = 0
+        self.prerender_reused = 0
+        self._md = MarkdownIt()
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+
+    def render(self, text: Optional[str]) -> str:
+        """Render text, serving repeated strings from the LRU cache."""
+        if not text:
+            return ""
+        html = self._lru.get(text)
+        if html is not None:
+            self.hits += 1
+            self._lru.move_to_end(text)
+            return html
+        self.misses += 1
+        html = self._md.render(text)
+        if self.max_entries > 0:
+            self._lru[text] = html
+            if len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+        return html
+
+    def prerender(
+        self, text: Optional[str], previous: Mapping[str, str] = MappingProxyType({})
+    ) -> Tuple[str, str]:
+        """
+        Render text for storage on a content record.
+
+        Returns (content hash, html); html is taken from previous (hash -> html
+        of the last build) when the text is unchanged.
+        """
+        if not text:
+            return "", ""
+        digest = content_hash(text)
+        html = previous.get(digest)
+        if html is not None:
+            self.prerender_reused += 1
+        else:
+            self.prerendered += 1
+            html = self._md.render(text)
+        return digest, html
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lru_size": len(self._lru),
+            "lru_max": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "prerendered": self.prerendered,
+            "prerender_reused": self.prerender_reused,
+        }
+
+
+markdown_renderer = MarkdownRenderer(
+    max_entries=int(os.getenv("MARKDOWN_CACHE_SIZE", "256"))
+)
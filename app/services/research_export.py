@@ -0,0 +1,319 @@
+"""
+Columnar research export: sessions, answers and feedback as Parquet/Arrow.
+
+- One zip bundle with sessions (selfeval flattened into columns), answers
+  (with the generator behind each image letter decoded via
+  content/exhibits/map.json) and feedback (one column per question)
+- Built from the DB in chunks of rows (server-side cursor); every chunk is
+  turned into a DataFrame and decoded with a vectorized merge in a worker
+  thread, so the event loop only fetches rows
+- The bundle is cached on disk and rebuilt only when the exported data
+  changed (research_data_version: answers are insert-only, so the last
+  Answer.id; sessions by a hash of the exported columns). Page views, which
+  refresh last_activity, do not invalidate it
+
+Needs pyarrow for writing Parquet/Arrow files.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import logger
+from app.models import Answer, Exhibit, Question, Session
+from app.services.analytics import SELFEVAL_FIELDS
+from app.services.content_bundle import load_yaml
+from app.services.export import decode_answer
+
+RESEARCH_EXPORT_CHUNK_SIZE = 50_000
+RESEARCH_EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def load_generator_map(content_dir: str = "content/exhibits") -> pd.DataFrame:
+    """
+    Letter -> generator lookup from map.json.
+
+    map.json is keyed by exhibit file name ({"01_bludicka": {"dalle": "D", ...}});
+    the file's YAML gives the slug stored in the DB (parsed through the
+    content bundle, like the other content readers).
+
+    Returns a DataFrame with columns exhibit_slug, answer (letter), generator.
+    """
+    base = Path(content_dir)
+    map_path = base / "map.json"
+    columns = ["exhibit_slug", "answer", "generator"]
+    if not map_path.exists():
+        return pd.DataFrame(columns=columns)
+
+    mapping = json.loads(map_path.read_text(encoding="utf-8"))
+    rows = []
+    for stem, generators in mapping.items():
+        yaml_path = next(
+            (p for p in (base / f"{stem}.yml", base / f"{stem}.yaml") if p.exists()), None
+        )
+        if yaml_path is None:
+            continue
+        slug = (load_yaml(yaml_path.read_bytes()) or {}).get("slug")
+        if not slug:
+            continue
+        rows.extend((slug, letter, generator) for generator, letter in generators.items())
+    return pd.DataFrame(rows, columns=columns)
+
+
+async def _stream_frames(
+    db_session: AsyncSession, stmt, columns: List[str], chunk_size: int, convert
+) -> pd.DataFrame:
+    """
+    Run stmt through a server-side cursor, building one DataFrame per chunk.
+
+    Building and converting the frames (row-wise decoding, merges) runs in a
+    worker thread, off the event loop.
+    """
+
+    def to_frame(rows) -> pd.DataFrame:
+        return convert(pd.DataFrame.from_records(rows, columns=columns))
+
+    frames = []
+    result = await db_session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions(chunk_size):
+        frames.append(await asyncio.to_thread(to_frame, partition))
+    if not frames:
+        return await asyncio.to_thread(to_frame, [])
+    return await asyncio.to_thread(pd.concat, frames, ignore_index=True)
+
+
+def _json_columns(values: pd.Series, keys: Optional[List[str]] = None) -> pd.DataFrame:
+    """Flatten a Series of JSON dicts into columns (missing -> NA)."""
+    records = [value if isinstance(value, dict) else {} for value in values]
+    frame = pd.DataFrame.from_records(records, index=values.index)
+    if keys is not None:
+        frame = frame.reindex(columns=keys)
+    return frame
+
+
+async def build_research_frames(
+    db_session: AsyncSession,
+    generator_map: Optional[pd.DataFrame] = None,
+    chunk_size: int = RESEARCH_EXPORT_CHUNK_SIZE,
+) -> Dict[str, pd.DataFrame]:
+    """Build the sessions, answers and feedback tables of the export."""
+    if generator_map is None:
+        generator_map = await asyncio.to_thread(load_generator_map)
+    sessions = Session.__table__
+    answers = Answer.__table__
+    questions = Question.__table__
+    exhibits = Exhibit.__table__
+
+    def convert_sessions(frame: pd.DataFrame) -> pd.DataFrame:
+        selfeval = _json_columns(frame.pop("selfeval_json"), list(SELFEVAL_FIELDS))
+        frame["uuid"] = frame["uuid"].astype(str)
+        return frame.join(selfeval.add_prefix("selfeval_"))
+
+    session_frame = await _stream_frames(
+        db_session,
+        select(
+            sessions.c.id.label("session_id"),
+            sessions.c.uuid,
+            sessions.c.created_at,
+            sessions.c.completed,
+            sessions.c.progress_count,
+            sessions.c.selfeval_json,
+        ).order_by(sessions.c.id),
+        ["session_id", "uuid", "created_at", "completed", "progress_count", "selfeval_json"],
+        chunk_size,
+        convert_sessions,
+    )
+
+    def convert_answers(frame: pd.DataFrame) -> pd.DataFrame:
+        frame["answer"] = [
+            decode_answer(value_json, value_text)
+            for value_json, value_text in zip(frame.pop("value_json"), frame.pop("value_text"))
+        ]
+        return frame.merge(generator_map, on=["exhibit_slug", "answer"], how="left")
+
+    answer_frame = await _stream_frames(
+        db_session,
+        select(
+            answers.c.session_id,
+            answers.c.created_at,
+            exhibits.c.slug,
+            answers.c.question_id,
+            questions.c.sort_order,
+            questions.c.text,
+            answers.c.value_json,
+            answers.c.value_text,
+        )
+        .select_from(answers)
+        .join(questions, answers.c.question_id == questions.c.id)
+        .outerjoin(exhibits, questions.c.exhibit_id == exhibits.c.id)
+        .order_by(answers.c.id),
+        [
+            "session_id",
+            "created_at",
+            "exhibit_slug",
+            "question_id",
+            "question_order",
+            "question_text",
+            "value_json",
+            "value_text",
+        ],
+        chunk_size,
+        convert_answers,
+    )
+
+    def categorize(frame: pd.DataFrame) -> pd.DataFrame:
+        for column in ("exhibit_slug", "question_text", "generator"):
+            frame[column] = frame[column].astype("category")
+        return frame
+
+    answer_frame = await asyncio.to_thread(categorize, answer_frame)
+
+    def convert_feedback(frame: pd.DataFrame) -> pd.DataFrame:
+        return frame[["session_id"]].join(_json_columns(frame["exhibition_feedback_json"]))
+
+    feedback_frame = await _stream_frames(
+        db_session,
+        select(sessions.c.id, sessions.c.exhibition_feedback_json)
+        .where(sessions.c.exhibition_feedback_json.is_not(None))
+        .order_by(sessions.c.id),
+        ["session_id", "exhibition_feedback_json"],
+        chunk_size,
+        convert_feedback,
+    )
+
+    def drop_empty_feedback(frame: pd.DataFrame) -> pd.DataFrame:
+        # Sessions without feedback ('null' JSON) have nothing but the id
+        feedback_columns = [c for c in frame.columns if c != "session_id"]
+        if feedback_columns:
+            frame = frame.dropna(how="all", subset=feedback_columns)
+        else:
+            frame = frame.iloc[0:0]
+        return frame.reset_index(drop=True)
+
+    return {
+        "sessions": session_frame,
+        "answers": answer_frame,
+        "feedback": await asyncio.to_thread(drop_empty_feedback, feedback_frame),
+    }
+
+
+def write_research_bundle(
+    frames: Dict[str, pd.DataFrame], path: str, fmt: str = "parquet"
+) -> str:
+    """Write the frames as <name>.parquet/.arrow files into a zip at path."""
+    suffix = RESEARCH_EXPORT_FORMATS[fmt]
+    tmp_path = f"{path}.tmp"
+    with tempfile.TemporaryDirectory() as workdir:
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as bundle:
+            for name, frame in frames.items():
+                file_path = os.path.join(workdir, name + suffix)
+                if fmt == "parquet":
+                    frame.to_parquet(file_path, index=False, compression="zstd")
+                else:
+                    frame.reset_index(drop=True).to_feather(file_path, compression="zstd")
+                # Already compressed columnar files: store as is
+                bundle.write(file_path, arcname=name + suffix)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _update_digest(digest, rows) -> None:
+    digest.update(repr([tuple(row) for row in rows]).encode())
+
+
+async def research_data_version(
+    db_session: AsyncSession,
+    generator_map: pd.DataFrame,
+    chunk_size: int = RESEARCH_EXPORT_CHUNK_SIZE,
+) -> str:
+    """
+    Digest of the exported data; changes whenever an export would.
+
+    Answers are insert-only, so their last id and count cover them. Sessions
+    change in place (progress, completion, selfeval, feedback), so their
+    exported columns are hashed; page views only move last_activity, which is
+    not exported. The generator map is part of the digest as well.
+    """
+    answers = Answer.__table__
+    sessions = Session.__table__
+    digest = hashlib.sha256()
+    answer_marker = await db_session.execute(
+        select(func.max(answers.c.id), func.count(answers.c.id))
+    )
+    digest.update(repr(tuple(answer_marker.one())).encode())
+    digest.update(repr(generator_map.values.tolist()).encode())
+    result = await db_session.stream(
+        select(
+            sessions.c.id,
+            sessions.c.uuid,
+            sessions.c.created_at,
+            sessions.c.completed,
+            sessions.c.progress_count,
+            sessions.c.selfeval_json,
+            sessions.c.exhibition_feedback_json,
+        )
+        .order_by(sessions.c.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    async for partition in result.partitions(chunk_size):
+        await asyncio.to_thread(_update_digest, digest, partition)
+    return digest.hexdigest()
+
+
+class ResearchExportCache:
+    """
+    Keeps the last bundle per format on disk until the exported data changes.
+
+    Concurrent requests for the same format wait for one build.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.builds = 0
+        self.hits = 0
+        # fmt -> (research_data_version, path)
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, db_session: AsyncSession, fmt: str = "parquet") -> str:
+        """Return the path of an up-to-date bundle, building it if needed."""
+        if fmt not in RESEARCH_EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        lock = self._locks.setdefault(fmt, asyncio.Lock())
+        async with lock:
+            generator_map = await asyncio.to_thread(load_generator_map)
+            version = await research_data_version(db_session, generator_map)
+            entry = self._entries.get(fmt)
+            if entry is not None and entry[0] == version and os.path.exists(entry[1]):
+                self.hits += 1
+                return entry[1]
+
+            frames = await build_research_frames(db_session, generator_map)
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"research_export_{fmt}.zip")
+            await asyncio.to_thread(write_research_bundle, frames, path, fmt)
+            self.builds += 1
+            self._entries[fmt] = (version, path)
+            logger.info(
+                f"Research export built: {len(frames['answers'])} answers, format={fmt}"
+            )
+            return path
+
+    def stats(self) -> Dict[str, Any]:
+        return {"builds": self.builds, "hits": self.hits}
+
+
+research_export_cache = ResearchExportCache(
+    os.getenv(
+        "RESEARCH_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "gallery-exports")
+    )
+)
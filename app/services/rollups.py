@@ -0,0 +1,347 @@
+"""
+Incrementally maintained analytics rollups for the admin dashboard.
+
+- The record_* functions are called from the visitor write units (see
+  app/routers/public.py), so rollups change in the same transaction as the
+  raw sessions/answers rows they summarize
+- Counters are bumped with INSERT ... ON CONFLICT DO UPDATE SET n = n + delta
+- rebuild_rollups recomputes every table from the raw rows (backfill, or after
+  fixing a bug in the incremental path): python scripts/rebuild_rollups.py
+- backfill_rollups runs the rebuild at startup when the rollups are empty but
+  raw data exists (first start after the rollup migration)
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Answer,
+    AnswerOptionRollup,
+    DailyRollup,
+    ExhibitRollup,
+    FeedbackRollup,
+    Question,
+    SelfevalRollup,
+    Session,
+)
+from app.services import analytics
+
+ROLLUP_MODELS = (
+    DailyRollup,
+    SelfevalRollup,
+    FeedbackRollup,
+    ExhibitRollup,
+    AnswerOptionRollup,
+)
+
+
+def session_day(created_at: datetime) -> str:
+    """Rollup day key for a session (same as SQLite date(created_at))."""
+    return created_at.date().isoformat()
+
+
+def has_content(value: Any) -> bool:
+    """Python counterpart of the analytics 'non-empty JSON' filter."""
+    return bool(value) and value != "null"
+
+
+def _selfeval_value(selfeval: Dict[str, Any], field: str) -> str:
+    value = selfeval.get(field)
+    return "N/A" if value is None else str(value)
+
+
+async def _increment(
+    db_session: AsyncSession, model, rows: Sequence[Dict[str, Any]], counters: Tuple[str, ...]
+) -> None:
+    """Upsert rows, adding their counter values to existing ones."""
+    if not rows:
+        return
+    table = model.__table__
+    stmt = sqlite_insert(table).values(list(rows))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key],
+        set_={name: table.c[name] + stmt.excluded[name] for name in counters},
+    )
+    await db_session.execute(stmt)
+
+
+async def _bump_daily(db_session: AsyncSession, day: str, **deltas: int) -> None:
+    if not any(deltas.values()):
+        return
+    counters = ("visitors", "feedback", "exhibit_answers", "exhibits_answered")
+    row = {"day": day, **{name: deltas.get(name, 0) for name in counters}}
+    await _increment(db_session, DailyRollup, [row], counters)
+
+
+def _counter_rows(counts: Counter, keys: Tuple[str, ...], **extra) -> List[Dict[str, Any]]:
+    return [
+        {**dict(zip(keys, key)), **extra, "count": count}
+        for key, count in counts.items()
+        if count
+    ]
+
+
+# ============================================================================
+# INCREMENTAL UPDATES (called inside visitor write units)
+# ============================================================================
+
+
+async def record_selfeval(
+    db_session: AsyncSession, session_id: int, selfeval: Dict[str, Any]
+) -> None:
+    """
+    Account for a session's selfeval being (re)submitted.
+
+    Must run before the session row is updated: the previous selfeval is read
+    from the row so a resubmission moves counts instead of adding them.
+    """
+    table = Session.__table__
+    row = (
+        await db_session.execute(
+            select(table.c.selfeval_json, table.c.created_at, table.c.progress_count).where(
+                table.c.id == session_id
+            )
+        )
+    ).one_or_none()
+    if row is None:
+        return
+
+    old = row.selfeval_json if has_content(row.selfeval_json) else None
+    new = selfeval if has_content(selfeval) else None
+
+    deltas: Counter = Counter()
+    for field in analytics.SELFEVAL_FIELDS:
+        if old:
+            deltas[(field, _selfeval_value(old, field))] -= 1
+        if new:
+            deltas[(field, _selfeval_value(new, field))] += 1
+    await _increment(
+        db_session, SelfevalRollup, _counter_rows(deltas, ("field", "value")), ("count",)
+    )
+
+    if bool(old) != bool(new):
+        sign = 1 if new else -1
+        await _bump_daily(
+            db_session,
+            session_day(row.created_at),
+            visitors=sign,
+            exhibits_answered=sign * (row.progress_count or 0),
+        )
+
+
+async def record_answers(
+    db_session: AsyncSession,
+    *,
+    day: str,
+    exhibit_id: Optional[int],
+    answers: Iterable[Tuple[int, Any]],
+    option_question_ids: Iterable[int],
+    first_for_exhibit: bool,
+    progress_added: bool,
+) -> None:
+    """
+    Account for newly inserted exhibit answers of one session.
+
+    Args:
+        answers: (question_id, value) of the rows actually inserted.
+        option_question_ids: Questions whose values are options (not free text).
+        first_for_exhibit: True if the session had no answers for the exhibit
+            before, i.e. the exhibit now counts as answered for it.
+        progress_added: True if the session is a visitor and its
+            progress_count was incremented by this write.
+    """
+    answers = list(answers)
+    if exhibit_id is None or not answers:
+        return
+
+    option_question_ids = set(option_question_ids)
+    options: Counter = Counter()
+    for question_id, value in answers:
+        if question_id in option_question_ids:
+            for option in analytics.answer_option_values(value):
+                options[(question_id, option)] += 1
+    await _increment(
+        db_session,
+        AnswerOptionRollup,
+        _counter_rows(options, ("question_id", "value"), exhibit_id=exhibit_id),
+        ("count",),
+    )
+
+    if first_for_exhibit:
+        await _increment(
+            db_session,
+            ExhibitRollup,
+            [{"exhibit_id": exhibit_id, "sessions_answered": 1}],
+            ("sessions_answered",),
+        )
+
+    await _bump_daily(
+        db_session,
+        day,
+        exhibit_answers=len(answers),
+        exhibits_answered=1 if progress_added else 0,
+    )
+
+
+async def record_feedback(
+    db_session: AsyncSession, day: str, feedback: Dict[str, Any]
+) -> None:
+    """Account for a session's (one-time) exhibition feedback submission."""
+    ratings: Counter = Counter()
+    for question_id, value in feedback.items():
+        if isinstance(value, int) and not isinstance(value, bool):
+            ratings[(question_id, value)] += 1
+    await _increment(
+        db_session, FeedbackRollup, _counter_rows(ratings, ("question_id", "rating")), ("count",)
+    )
+    await _bump_daily(db_session, day, feedback=1)
+
+
+# ============================================================================
+# REBUILD (backfill from raw tables)
+# ============================================================================
+
+
+async def backfill_rollups(db_session: AsyncSession) -> Optional[Dict[str, int]]:
+    """
+    Rebuild the rollups if they are empty although sessions or answers exist.
+
+    Every visitor, answer and feedback write adds to rollup_daily, so an empty
+    rollup_daily next to such rows means the rollups were never filled.
+    Returns the rebuild counts, or None when nothing had to be done.
+    """
+    if await db_session.scalar(select(DailyRollup.day).limit(1)) is not None:
+        return None
+    has_data = select(Session.id).where(
+        or_(
+            and_(*analytics.has_json_content(Session.selfeval_json)),
+            and_(*analytics.has_json_content(Session.exhibition_feedback_json)),
+        )
+    ).exists()
+    has_answers = select(Answer.id).exists()
+    if not await db_session.scalar(select(or_(has_data, has_answers))):
+        return None
+    return await rebuild_rollups(db_session)
+
+
+async def rebuild_rollups(db_session: AsyncSession) -> Dict[str, int]:
+    """
+    Recompute all rollup tables from sessions/answers and commit.
+
+    Returns the number of rows written per rollup table.
+    """
+    for model in ROLLUP_MODELS:
+        await db_session.execute(delete(model))
+
+    day = func.date(Session.created_at)
+    visitor_where = analytics.has_json_content(Session.selfeval_json)
+    feedback_where = analytics.has_json_content(Session.exhibition_feedback_json)
+
+    daily: Dict[str, Dict[str, Any]] = {}
+
+    def daily_row(key: str) -> Dict[str, Any]:
+        return daily.setdefault(
+            key,
+            {"day": key, "visitors": 0, "feedback": 0, "exhibit_answers": 0, "exhibits_answered": 0},
+        )
+
+    result = await db_session.execute(
+        select(
+            day.label("day"),
+            func.count(Session.id).label("visitors"),
+            func.coalesce(func.sum(Session.progress_count), 0).label("exhibits_answered"),
+        )
+        .where(*visitor_where)
+        .group_by(day)
+    )
+    for row in result:
+        daily_row(row.day).update(visitors=row.visitors, exhibits_answered=row.exhibits_answered)
+
+    result = await db_session.execute(
+        select(day.label("day"), func.count(Session.id).label("feedback"))
+        .where(*feedback_where)
+        .group_by(day)
+    )
+    for row in result:
+        daily_row(row.day)["feedback"] = row.feedback
+
+    result = await db_session.execute(
+        select(day.label("day"), func.count(Answer.id).label("exhibit_answers"))
+        .select_from(Answer)
+        .join(Question, Answer.question_id == Question.id)
+        .join(Session, Answer.session_id == Session.id)
+        .where(Question.exhibit_id.is_not(None))
+        .group_by(day)
+    )
+    for row in result:
+        daily_row(row.day)["exhibit_answers"] = row.exhibit_answers
+
+    if daily:
+        await db_session.execute(sqlite_insert(DailyRollup.__table__).values(list(daily.values())))
+
+    # Selfeval value counts (same grouping as the raw dashboard query)
+    selfeval_stats = await analytics.get_detailed_selfeval_stats(db_session)
+    selfeval_rows = [
+        {"field": field, "value": str(value), "count": count}
+        for field, data in selfeval_stats["fields"].items()
+        for value, count in data["counts"].items()
+    ]
+    await _increment(db_session, SelfevalRollup, selfeval_rows, ("count",))
+
+    # Likert histograms for the questions in exhibition_feedback.yml
+    question_ids = [
+        qid for data in analytics._build_feedback_catalog().values() for qid in data["questions"]
+    ]
+    distributions = await analytics.get_feedback_rating_counts(db_session, question_ids)
+    feedback_rows = [
+        {"question_id": question_id, "rating": rating, "count": count}
+        for question_id, distribution in distributions.items()
+        for rating, count in distribution.items()
+    ]
+    if feedback_rows:
+        await db_session.execute(sqlite_insert(FeedbackRollup.__table__).values(feedback_rows))
+
+    exhibit_counts = await analytics.get_exhibit_completion_counts(db_session)
+    exhibit_rows = [
+        {"exhibit_id": exhibit_id, "sessions_answered": count}
+        for exhibit_id, count in exhibit_counts.items()
+    ]
+    if exhibit_rows:
+        await db_session.execute(sqlite_insert(ExhibitRollup.__table__).values(exhibit_rows))
+
+    # Option counts (streamed; values of multi-choice answers are JSON arrays)
+    option_counts = await analytics.get_answer_option_counts(db_session)
+    exhibit_of = dict(
+        (
+            await db_session.execute(
+                select(Question.id, Question.exhibit_id).where(
+                    Question.id.in_(list(option_counts))
+                )
+            )
+        ).all()
+    )
+    option_rows = [
+        {
+            "question_id": question_id,
+            "value": value,
+            "exhibit_id": exhibit_of[question_id],
+            "count": count,
+        }
+        for question_id, counts in option_counts.items()
+        for value, count in counts.items()
+    ]
+    await _increment(db_session, AnswerOptionRollup, option_rows, ("count",))
+
+    await db_session.commit()
+    return {
+        "rollup_daily": len(daily),
+        "rollup_selfeval": len(selfeval_rows),
+        "rollup_feedback": len(feedback_rows),
+        "rollup_exhibits": len(exhibit_rows),
+        "rollup_answer_options": len(option_rows),
+    }
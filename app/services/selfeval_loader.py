@@ -1,59 +1,52 @@
-import yaml
-from pathlib import Path
+"""
+Selfeval questionnaire configuration loader.
+
+content/selfeval.yml is parsed by the config registry
+(app/services/config_registry.py) into immutable structures.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+from app.services.config_registry import config_registry, freeze
 
 SELFEVAL_PATH = "content/selfeval.yml"
+META_KEYS = ("title", "lead", "continue_button")
+
+
+@dataclass(frozen=True)
+class SelfEvalData:
+    questions: Tuple[Any, ...]
+    meta: Any
+
+
+def build_selfeval_config(document: Dict[str, Any]) -> SelfEvalData:
+    # Support both flattened top-level format and nested 'en' section.
+    nested = document.get("en") or {}
+    questions = document.get("questions") or nested.get("questions") or []
+    # Top-level meta keys first, then the nested 'en' section
+    if any(document.get(key) for key in META_KEYS):
+        meta_source = document
+    else:
+        meta_source = nested
+    return SelfEvalData(
+        questions=freeze(questions),
+        meta=freeze({key: meta_source.get(key) for key in META_KEYS}),
+    )
+
+
+config_registry.register("selfeval", SELFEVAL_PATH, build=build_selfeval_config)
 
 
 class SelfEvalConfig:
-    _data = None
-
-    @classmethod
-    def load(cls):
-        path = Path(SELFEVAL_PATH)
-        if not path.exists():
-            cls._data = {}
-            return
-        cls._data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
-
-    @classmethod
-    def get_questions(cls, lang: str = "en"):
-        if cls._data is None:
-            cls.load()
-        # Support both flattened top-level format and nested 'en' section.
-        if cls._data.get("questions"):
-            return cls._data.get("questions", [])
-        if cls._data.get("en"):
-            return cls._data.get("en", {}).get("questions", [])
-        return []
-
-    @classmethod
-    def get_meta(cls, lang: str = "en"):
+    @staticmethod
+    def get_questions(lang: str = "en") -> Tuple[Any, ...]:
+        return config_registry.get("selfeval").questions
+
+    @staticmethod
+    def get_meta(lang: str = "en"):
         """Return metadata for the selfeval page (title, lead, continue_button).
 
         The YAML keeps these under the language key (e.g., en.title).
         """
-        if cls._data is None:
-            cls.load()
-        # Support top-level meta keys first, then nested 'en' section
-        if (
-            cls._data.get("title")
-            or cls._data.get("lead")
-            or cls._data.get("continue_button")
-        ):
-            return {
-                "title": cls._data.get("title"),
-                "lead": cls._data.get("lead"),
-                "continue_button": cls._data.get("continue_button"),
-            }
-        if cls._data.get("en"):
-            meta = cls._data.get("en", {})
-            return {
-                "title": meta.get("title"),
-                "lead": meta.get("lead"),
-                "continue_button": meta.get("continue_button"),
-            }
-        return {"title": None, "lead": None, "continue_button": None}
-
-
-# Načti při startu aplikace
-SelfEvalConfig.load()
+        return config_registry.get("selfeval").meta
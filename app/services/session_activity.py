@@ -0,0 +1,163 @@
+"""
+Write-behind buffer for session last_activity refreshes.
+
+- track_session records activity in memory instead of committing per request
+- Timestamps are coalesced per session UUID (latest wins)
+- A background task flushes them as one bulk UPDATE every N seconds,
+  when the buffer grows past a size threshold, and at shutdown
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db import engine
+from app.logging_config import session_logger
+from app.models import Session
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; treat them as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class SessionActivityBuffer:
+    """
+    Coalesces session activity timestamps and persists them in bulk.
+
+    Args:
+        flush_interval: Seconds between background flushes.
+        max_staleness: Activity newer than this many seconds is not re-recorded.
+            Persisted last_activity may therefore trail real activity by up to
+            this bound, so TTL checks should allow for it (see ttl_with_staleness).
+        max_pending: Pending entries that trigger an early flush.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 5.0,
+        max_staleness: float = 60.0,
+        max_pending: int = 1000,
+    ):
+        self.flush_interval = flush_interval
+        self.max_staleness = max_staleness
+        self.max_pending = max_pending
+        self._pending: Dict[UUID, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def last_activity(self, session_uuid: UUID, stored: datetime) -> datetime:
+        """Return the most recent known activity: buffered or persisted."""
+        stored = _as_utc(stored)
+        buffered = self._pending.get(session_uuid)
+        if buffered is not None and buffered > stored:
+            return buffered
+        return stored
+
+    def ttl_with_staleness(self, session_ttl: float) -> float:
+        """TTL bound to use when comparing against (possibly stale) last_activity."""
+        return session_ttl + self.max_staleness
+
+    def touch(
+        self, session_uuid: UUID, stored: datetime, now: Optional[datetime] = None
+    ) -> datetime:
+        """
+        Record activity for a session and return the effective last_activity.
+
+        Nothing is written to the DB here; the timestamp is flushed later.
+        """
+        now = now or datetime.now(timezone.utc)
+        current = self.last_activity(session_uuid, stored)
+        if (now - current).total_seconds() < self.max_staleness:
+            return current
+
+        self._pending[session_uuid] = now
+        if len(self._pending) >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+        return now
+
+    async def flush(self, bind: Optional[AsyncEngine] = None) -> int:
+        """Persist all pending timestamps in a single executemany UPDATE."""
+        if not self._pending:
+            return 0
+
+        bind = bind or engine
+        pending, self._pending = self._pending, {}
+        table = Session.__table__
+        # Never move last_activity back: visitor writes stamp it as well, and
+        # the CDC feed (app/services/cdc.py) relies on it only growing
+        stmt = (
+            update(table)
+            .where(table.c.uuid == bindparam("b_uuid"))
+            .values(
+                last_activity=func.max(
+                    table.c.last_activity,
+                    bindparam("b_last_activity", type_=table.c.last_activity.type),
+                )
+            )
+        )
+        params = [
+            {"b_uuid": session_uuid, "b_last_activity": ts}
+            for session_uuid, ts in pending.items()
+        ]
+        try:
+            async with bind.begin() as conn:
+                await conn.execute(stmt, params)
+        except Exception as exc:
+            # Put entries back unless newer activity arrived meanwhile
+            for session_uuid, ts in pending.items():
+                if self._pending.get(session_uuid, ts) <= ts:
+                    self._pending[session_uuid] = ts
+            session_logger.error(f"Session activity flush failed: {exc}")
+            raise
+
+        session_logger.debug(f"Flushed last_activity for {len(params)} sessions")
+        return len(params)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Already logged; retry on next tick
+                pass
+
+    def start(self) -> None:
+        """Start the background flush task (call from app lifespan)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+
+activity_buffer = SessionActivityBuffer(
+    flush_interval=float(os.getenv("SESSION_ACTIVITY_FLUSH_INTERVAL", "5")),
+    max_staleness=float(os.getenv("SESSION_ACTIVITY_MAX_STALENESS", "60")),
+    max_pending=int(os.getenv("SESSION_ACTIVITY_MAX_PENDING", "1000")),
+)
@@ -1,19 +1,32 @@
-import yaml
-from pathlib import Path
-from typing import Dict, Any
+"""
+Site-level copy (header, footer, index, thanks, ...) from content/site_copy.yml.
 
+Parsed by the config registry (app/services/config_registry.py); main.py keeps
+the site_copy template global in sync with it.
+"""
 
-def load_site_copy(content_dir: str = "content") -> Dict[str, Any]:
-    """Load site-level copy from content/site_copy.yml.
+from typing import Any, Mapping
 
-    Returns a nested dict with keys like 'header', 'footer', 'index', 'thanks'.
-    If file is missing or invalid, returns an empty dict.
+from jinja2 import Environment
+
+from app.services.config_registry import config_registry
+
+SITE_COPY_PATH = "content/site_copy.yml"
+
+config_registry.register("site_copy", SITE_COPY_PATH)
+
+
+def get_site_copy() -> Mapping[str, Any]:
+    """Return the nested, read-only site copy.
+
+    Has keys like 'header', 'footer', 'index', 'thanks'. If the file is
+    missing or invalid, returns an empty mapping.
     """
-    p = Path(content_dir) / "site_copy.yml"
-    if not p.exists():
-        return {}
-    try:
-        data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-        return data
-    except Exception:
-        return {}
+    return config_registry.get("site_copy")
+
+
+def bind_site_copy_global(env: Environment) -> None:
+    """Set env.globals["site_copy"] now and again whenever the file is reloaded."""
+    config_registry.add_listener(
+        "site_copy", lambda value: env.globals.__setitem__("site_copy", value)
+    )
@@ -6,10 +6,15 @@ load YAML content. To be called from FastAPI app startup later.
 """
 
 import asyncio
-from typing import Optional
+import time
+from typing import Dict
 
 from app.db import init_database, get_session
+from app.logging_config import logger
+from app.services.content_bundle import content_bundle
 from app.services.content_loader import load_content_from_dir
+from app.services.content_registry import build_content_registry
+from app.services.rollups import backfill_rollups
 
 
 async def run_startup_tasks(
@@ -17,18 +22,50 @@ async def run_startup_tasks(
 ) -> None:
     """
     Initialize database and (optionally) load content from YAML.
-    Designed to be awaited from application startup.
+    The in-memory content registry is rebuilt from the DB afterwards, and
+    empty analytics rollups are backfilled.
+    Designed to be awaited from application startup; step timings are logged.
     """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
     await init_database()
+    timings["database"] = time.perf_counter() - started
     if load_content:
         session = await get_session()
         try:
+            started = time.perf_counter()
             await load_content_from_dir(session=session, content_dir=content_dir)
+            timings["content_sync"] = time.perf_counter() - started
         except Exception as exc:
             # Non-fatal: app should still start even if content fails to load
             print(f"[startup_tasks] Content load failed: {exc}")
+        try:
+            started = time.perf_counter()
+            await build_content_registry(session)
+            timings["content_registry"] = time.perf_counter() - started
+        except Exception as exc:
+            print(f"[startup_tasks] Content registry build failed: {exc}")
         finally:
             await session.close()
+    session = await get_session()
+    try:
+        started = time.perf_counter()
+        counts = await backfill_rollups(session)
+        if counts is not None:
+            timings["rollup_backfill"] = time.perf_counter() - started
+            logger.info(f"Analytics rollups were empty, rebuilt: {counts}")
+    except Exception as exc:
+        # Non-fatal: the dashboard shows zeros until scripts/rebuild_rollups.py
+        logger.error(f"Rollup backfill failed: {exc}")
+    finally:
+        await session.close()
+    bundle = content_bundle.stats()
+    logger.info(
+        "Startup tasks: "
+        + ", ".join(f"{name}={seconds * 1000:.1f} ms" for name, seconds in timings.items())
+        + f" (content bundle: {bundle['documents']} documents loaded in "
+        f"{bundle['load_ms']:.1f} ms, {bundle['hits']} hits, {bundle['misses']} misses)"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+Signed stateless session cookie for Gallery Twin.
+
+When SESSION_MODE=signed, the session cookie carries the session UUID, the
+visitor's randomized exhibit order and the set of answered exhibits, signed
+with itsdangerous. Read-only pages can then render from the cookie alone and
+the DB is only touched when a visitor submits a form.
+
+Cookie payload: [uuid_hex, order, answered_bitmask]
+- order is the list of slugs itself, not positions in the content registry:
+  the slug list changes when content is reloaded, and positions would then
+  point at other exhibits
+- bit i of answered_bitmask is set when order[i] has been answered
+"""
+
+import os
+import uuid
+from dataclasses import dataclass, replace
+from typing import FrozenSet, Optional, Tuple
+
+from itsdangerous import BadData, URLSafeTimedSerializer
+
+SESSION_MODE = os.getenv("SESSION_MODE", "db").lower()
+
+_SALT = "gallery-session"
+
+
+def signed_sessions_enabled() -> bool:
+    """Return True if sessions are carried in signed cookies."""
+    return SESSION_MODE == "signed"
+
+
+@dataclass(frozen=True, slots=True)
+class SessionCookie:
+    """Session state decoded from (or to be encoded into) the signed cookie."""
+
+    uuid: uuid.UUID
+    exhibit_order: Tuple[str, ...]
+    answered: FrozenSet[str] = frozenset()
+
+    @property
+    def exhibit_order_json(self) -> dict:
+        """Same shape as Session.exhibit_order_json."""
+        return {"order": list(self.exhibit_order)}
+
+    def has_answered(self, slug: str) -> bool:
+        return slug in self.answered
+
+    def with_answered(self, slug: str) -> "SessionCookie":
+        return replace(self, answered=self.answered | {slug})
+
+
+def _decode_order(value) -> Tuple[str, ...]:
+    # Cookies from before slugs were stored carry a string of positions
+    if not isinstance(value, list) or not all(isinstance(slug, str) for slug in value):
+        raise ValueError("Unsupported exhibit order")
+    return tuple(value)
+
+
+def encode_session_cookie(cookie: SessionCookie, secret_key: str) -> str:
+    """Serialize and sign session state for the cookie value."""
+    answered_mask = 0
+    for i, slug in enumerate(cookie.exhibit_order):
+        if slug in cookie.answered:
+            answered_mask |= 1 << i
+    payload = [
+        cookie.uuid.hex,
+        list(cookie.exhibit_order),
+        answered_mask,
+    ]
+    return URLSafeTimedSerializer(secret_key, salt=_SALT).dumps(payload)
+
+
+def decode_session_cookie(
+    value: str, secret_key: str, max_age: int
+) -> Optional[SessionCookie]:
+    """Verify and decode a cookie value; return None if invalid or expired."""
+    try:
+        uuid_hex, order_value, answered_mask = URLSafeTimedSerializer(
+            secret_key, salt=_SALT
+        ).loads(value, max_age=max_age)
+        order = _decode_order(order_value)
+        return SessionCookie(
+            uuid=uuid.UUID(hex=uuid_hex),
+            exhibit_order=order,
+            answered=frozenset(
+                slug for i, slug in enumerate(order) if answered_mask >> i & 1
+            ),
+        )
+    except (BadData, ValueError, TypeError):
+        return None